@@ -1,27 +1,81 @@
 # MT5 Auto Trading Bot with Gemini AI
-# Requirements: pip install MetaTrader5 pandas numpy google-generativeai ta python-dotenv python-telegram-bot beautifulsoup4 requests lxml
+# Requirements: pip install MetaTrader5 pandas numpy google-generativeai ta python-dotenv python-telegram-bot httpx[http2] lxml
 
 import MetaTrader5 as mt5
 import pandas as pd
 import numpy as np
 import google.generativeai as genai
+import copy
 import json
+import atexit
+import math
 import time
 from datetime import datetime, timedelta, timezone
 import logging
 from typing import Dict, List, Optional, Tuple
 import ta  # Technical Analysis library
 import os
+import pickle
 from dotenv import load_dotenv
 import asyncio
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
+from telegram.error import RetryAfter, TelegramError
 import threading
-import requests
-from bs4 import BeautifulSoup
+import concurrent.futures
+import heapq
+import bisect
+from collections import OrderedDict, defaultdict, namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType, SimpleNamespace
+import httpx
+import lxml.html
+from lxml import etree
 import pytz
 from urllib.parse import urljoin
 
+# Optional accelerators (see requirement.txt) - fall back to pandas/ta/stdlib when missing
+try:
+    import talib
+except ImportError:
+    talib = None
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports @njit and @njit(...))"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+try:
+    import h2  # noqa: F401 - lets httpx negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# JSON codec bound once at import - orjson (bytes out, numpy-aware) when installed
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps_line(obj) -> bytes:
+        """Serialize one JSON line as UTF-8 bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+else:
+    _json_loads = json.loads
+
+    def _json_dumps_line(obj) -> bytes:
+        """Serialize one JSON line as UTF-8 bytes"""
+        return (json.dumps(obj) + '\n').encode('utf-8')
+
 # Load environment variables
 load_dotenv()
 
@@ -36,9 +90,241 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared worker pool for MT5 data requests (terminal IPC releases the GIL)
+_MARKET_DATA_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix='mt5-data')
+
+# Worker pool for batched order_send calls (SL/TP modifies and closes across positions)
+_ORDER_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix='mt5-orders')
+
+# MT5 trade constants bound once (hot order paths skip the module attribute lookups)
+_ORDER_TYPE_BUY = mt5.ORDER_TYPE_BUY
+_ORDER_TYPE_SELL = mt5.ORDER_TYPE_SELL
+_CLOSE_ORDER_TYPE = (mt5.ORDER_TYPE_SELL, mt5.ORDER_TYPE_BUY)  # indexed by position.type (BUY=0, SELL=1)
+_RETCODE_DONE = mt5.TRADE_RETCODE_DONE
+
+# Fields shared by every market deal request; callers add symbol/volume/type/price/etc.
+_BASE_DEAL_REQUEST = MappingProxyType({
+    "action": mt5.TRADE_ACTION_DEAL,
+    "deviation": 20,
+    "type_time": mt5.ORDER_TIME_GTC,
+    "type_filling": mt5.ORDER_FILLING_IOC,
+})
+
+# Long-lived event loop shared by Telegram and the news fetcher, so HTTP connection pools survive between calls
+_background_loop = None
+_background_thread = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared asyncio loop, starting its daemon thread on first use"""
+    global _background_loop, _background_thread
+    with _background_loop_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            _background_loop = asyncio.new_event_loop()
+            _background_thread = threading.Thread(target=_background_loop.run_forever,
+                                                  name='async-loop', daemon=True)
+            _background_thread.start()
+        return _background_loop
+
+
+def _run_in_background(coro) -> concurrent.futures.Future:
+    """Schedule coroutine on the shared loop, returns concurrent.futures.Future"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+
+
+def _stop_background_loop():
+    """Stop and close the shared loop (after all users have shut down)"""
+    global _background_loop, _background_thread
+    with _background_loop_lock:
+        loop, thread = _background_loop, _background_thread
+        _background_loop = _background_thread = None
+    if loop is None or loop.is_closed():
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    if not loop.is_running():
+        loop.close()
+
+
+@lru_cache(maxsize=256)
+def _pip_scale(symbol: str) -> int:
+    """Price-to-pip multiplier (JPY pairs quote 2 decimals)"""
+    return 100 if 'JPY' in symbol else 10000
+
+
+@lru_cache(maxsize=256)
+def _base_symbol(symbol: str) -> str:
+    """Symbol without broker suffix (EURUSDc, EURUSD.pro -> EURUSD)"""
+    return symbol.rstrip('abcdefghijklmnopqrstuvwxyz.#')
+
+
+# Numpy views of the columns the analysis helpers read - built once per timeframe so
+# helpers share the arrays instead of repeating DataFrame column lookups
+Frame = namedtuple('Frame', 'open high low close tick_volume rsi macd macd_signal sma_20 sma_50 atr')
+
+
+def _make_frame(df: pd.DataFrame) -> Optional[Frame]:
+    """Frame of column views for an indicator DataFrame (None when there is no data)"""
+    if df.empty:
+        return None
+    return Frame(*(df[column].to_numpy() for column in Frame._fields))
+
+
+# Market session by hour of day (Bangkok time), one session per hour: US until 05:00,
+# Asian until 14:00, European until 20:00, then US again
+_SESSION_BY_HOUR = tuple(
+    'US' if hour < 5 else 'ASIAN' if hour < 14 else 'EUROPEAN' if hour < 20 else 'US'
+    for hour in range(24)
+)
+
+
+def _sessions_by_hour(trading_sessions: Dict) -> Tuple[Optional[str], ...]:
+    """Session for each hour of the day - first configured session containing the hour (None if none)"""
+    def in_session(session, hour):
+        start, end = session['start'], session['end']
+        # Sessions crossing midnight (start > end, e.g. US 20 -> 5) wrap around
+        return start <= hour < end if start <= end else (hour >= start or hour < end)
+
+    return tuple(
+        next((name for name, session in trading_sessions.items()
+              if name != 'enabled' and in_session(session, hour)), None)
+        for hour in range(24)
+    )
+
+
+@njit(cache=True)
+def _momentum_score_kernel(rsi: float, macd: float, macd_signal: float, close: float,
+                           sma_20: float, tick_volume: float, vol_ma: float) -> float:
+    """Momentum score (0-100) from the latest H1 values"""
+    score = 50.0  # Neutral
+
+    # RSI momentum
+    if rsi > 70:
+        score += 15
+    elif rsi < 30:
+        score -= 15
+    else:
+        score += (rsi - 50) * 0.3
+
+    # MACD momentum
+    if macd > macd_signal:
+        score += 10
+    else:
+        score -= 10
+
+    # Price vs MA
+    if close > sma_20:
+        score += 10
+    else:
+        score -= 10
+
+    # Volume momentum
+    if tick_volume > vol_ma * 1.5:
+        score += 10
+    elif tick_volume < vol_ma * 0.5:
+        score -= 10
+
+    # Clamp between 0-100
+    return max(0.0, min(100.0, score))
+
+
+class TokenBucket:
+    """Async token bucket rate limiter"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate  # Tokens added per second
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        """Wait until a token is available and consume it"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
 class TelegramNotifier:
     """Telegram Notification System"""
 
+    _QUEUE_SIZE = 256
+    _LINGER_SECONDS = 0.5  # Merge alerts posted within this window into one send
+    _POOL_SIZE = 8  # Keep-alive connections reused across sends
+    _MAX_MESSAGE_LENGTH = 4096  # Telegram hard limit per message
+
+    # Alert templates and emoji lookups, built once
+    _SIGNAL_EMOJI = {'BUY': "📈", 'SELL': "📉"}
+    _CLOSED_EMOJI = {1: ("💰", "✅"), -1: ("💸", "❌"), 0: ("➖", "⚪")}
+    _GREEN_BARS = tuple("🟩" * i + "⬜" * (10 - i) for i in range(11))
+    _RED_BARS = tuple("🟥" * i + "⬜" * (10 - i) for i in range(11))
+
+    _SIGNAL_TEMPLATE = """
+{emoji} <b>SIGNAL DETECTED</b>
+━━━━━━━━━━━━━━━━━━━
+📊 Symbol: <b>{symbol}</b>
+📍 Signal: <b>{decision}</b>
+💯 Confidence: <b>{confidence}%</b>
+💰 Entry: <b>{entry:.5f}</b>
+🛑 Stop Loss: <b>{sl:.5f}</b>
+🎯 Take Profit: <b>{tp:.5f}</b>
+⏰ Time: {time}
+
+📝 <i>Reasoning: {reasoning}</i>
+        """
+
+    _OPENED_TEMPLATE = """
+{emoji} <b>TRADE OPENED</b> {emoji}
+━━━━━━━━━━━━━━━━━━━
+📊 Symbol: <b>{symbol}</b>
+📍 Type: <b>{decision}</b>
+📦 Volume: <b>{lot_size} lots</b>
+💰 Entry: <b>{entry:.5f}</b>
+🛑 SL: <b>{sl:.5f}</b> ({risk_pips:.1f} pips)
+🎯 TP: <b>{tp:.5f}</b> ({reward_pips:.1f} pips)
+📊 R:R Ratio: <b>1:{rr_ratio:.1f}</b>
+🎫 Ticket: <b>#{ticket}</b>
+⏰ Time: {time}
+
+💯 Confidence: {confidence}%
+        """
+
+    _CLOSED_TEMPLATE = """
+{status_emoji} <b>TRADE CLOSED</b> {status_emoji}
+━━━━━━━━━━━━━━━━━━━
+📊 Symbol: <b>{symbol}</b>
+💵 P/L: <b>${profit:.2f}</b> {emoji}
+📍 Close Price: <b>{price:.5f}</b>
+🎫 Ticket: <b>#{ticket}</b>
+⏰ Time: {time}
+
+{pl_bar}
+        """
+
+    _MODIFIED_TEMPLATE = """
+🔧 <b>POSITION MODIFIED</b>
+━━━━━━━━━━━━━━━━━━━
+📊 Symbol: <b>{symbol}</b>
+🛑 New SL: <b>{sl:.5f}</b>
+🎯 New TP: <b>{tp:.5f}</b>
+🎫 Ticket: <b>#{ticket}</b>
+⏰ Time: {time}
+📝 Trailing stop activated
+        """
+
+    _ERROR_TEMPLATE = """
+⚠️ <b>TRADE ERROR</b> ⚠️
+━━━━━━━━━━━━━━━━━━━
+📊 Symbol: <b>{symbol}</b>
+❌ Error: <b>{error}</b>
+💬 Details: {comment}
+⏰ Time: {time}
+        """
+
     def __init__(self, bot_token: str, chat_id: str):
         """
         Initialize Telegram Bot
@@ -47,14 +333,24 @@ class TelegramNotifier:
         """
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.bot = Bot(token=bot_token)
+        # Pooled keep-alive connections (PTB default is a single connection), HTTP/2 when h2 is installed
+        self.bot = Bot(token=bot_token, request=HTTPXRequest(
+            connection_pool_size=self._POOL_SIZE, http_version='2' if HTTP2_AVAILABLE else '1.1'))
         self.enabled = bool(bot_token and chat_id)
-        self.loop = None  # Will create event loop when needed
+
+        # Shared long-lived event loop so the bot's HTTP connection pool survives between messages
+        self._loop = _get_background_loop()
+        self._closed = False
+
+        # Telegram limits: ~30 msg/s globally, ~1 msg/s per chat (short bursts tolerated)
+        self._global_limiter = TokenBucket(rate=25, burst=30)
+        self._chat_limiter = TokenBucket(rate=1, burst=3)
+        self._run_async(self._start_consumer()).result(timeout=5)
 
         if self.enabled:
             # Test connection
             try:
-                self._run_async(self._test_connection())
+                self._run_async(self._test_connection()).result(timeout=30)
                 logger.info("Telegram notifier initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Telegram notifier: {e}")
@@ -63,27 +359,22 @@ class TelegramNotifier:
             logger.info("Telegram notifier disabled (no token/chat_id)")
 
     def _run_async(self, coro):
-        """Run async coroutine safely"""
+        """Schedule coroutine on the background loop, returns concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def close(self):
+        """Flush queued messages and shutdown bot session"""
+        if self._closed or self._loop.is_closed():
+            return
+        self._closed = True
         try:
-            # Try to get existing event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # If we're in an async context, create a task
-                return asyncio.create_task(coro)
-            except RuntimeError:
-                # No running loop, create new one
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    return loop.run_until_complete(coro)
-                finally:
-                    loop.close()
+            self._run_async(self._shutdown()).result(timeout=20)
         except Exception as e:
-            logger.error(f"Async execution error: {e}")
-            raise
+            logger.debug(f"Telegram shutdown error: {e}")
 
     async def _test_connection(self):
         """Test Telegram connection"""
+        await self.bot.initialize()
         await self.bot.send_message(
             chat_id=self.chat_id,
             text="🤖 MT5 Trading Bot Started\n"
@@ -97,10 +388,78 @@ class TelegramNotifier:
         if not self.enabled:
             return
 
+        # Non-blocking: the consumer on the background loop paces the actual sends
+        self._loop.call_soon_threadsafe(self._enqueue, message, parse_mode)
+
+    def _enqueue(self, message: str, parse_mode: str):
+        """Put message on the send queue (runs on the background loop)"""
         try:
-            self._run_async(self._send_async(message, parse_mode))
-        except Exception as e:
-            logger.error(f"Failed to send Telegram message: {e}")
+            self._queue.put_nowait((message, parse_mode))
+        except asyncio.QueueFull:
+            logger.warning("Telegram queue full, dropping message")
+
+    async def _start_consumer(self):
+        """Create send queue and consumer task on the background loop"""
+        self._queue = asyncio.Queue(maxsize=self._QUEUE_SIZE)
+        self._consumer_task = asyncio.create_task(self._consume())
+
+    async def _consume(self):
+        """Pull messages from the queue and send them within rate limits"""
+        carry = None
+        while True:
+            message, parse_mode = carry or await self._queue.get()
+            last = message  # Most recently merged alert
+            carry = None
+
+            # Linger briefly so alerts fired together go out as one send
+            deadline = self._loop.time() + self._LINGER_SECONDS
+            while True:
+                if self._queue.empty():
+                    remaining = deadline - self._loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        next_message, next_mode = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    next_message, next_mode = self._queue.get_nowait()
+                if (next_mode != parse_mode or
+                        len(message) + len(next_message) + 1 > self._MAX_MESSAGE_LENGTH):
+                    carry = (next_message, next_mode)
+                    break
+                if next_message != last:  # Drop repeats of the alert just merged
+                    message = f"{message}\n{next_message}"
+                    last = next_message
+                self._queue.task_done()
+
+            await self._deliver(message, parse_mode)
+            self._queue.task_done()
+
+    async def _deliver(self, message: str, parse_mode: str, max_attempts: int = 3):
+        """Send one message, honoring rate limits and flood-control retries"""
+        for _ in range(max_attempts):
+            await self._chat_limiter.acquire()
+            await self._global_limiter.acquire()
+            try:
+                await self._send_async(message, parse_mode)
+                return
+            except RetryAfter as e:
+                logger.warning(f"Telegram flood control, retrying in {e.retry_after}s")
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                logger.error(f"Failed to send Telegram message: {e}")
+                return
+        logger.error("Failed to send Telegram message: flood control retries exhausted")
+
+    async def _shutdown(self):
+        """Wait for queued messages, then stop consumer and close bot session"""
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=10)
+        except asyncio.TimeoutError:
+            logger.warning(f"Telegram shutdown with {self._queue.qsize()} unsent messages")
+        self._consumer_task.cancel()
+        await self.bot.shutdown()
 
     async def _send_async(self, message: str, parse_mode: str):
         """Async send message"""
@@ -116,136 +475,123 @@ class TelegramNotifier:
         if not self.enabled:
             return
         
+        now_str = time.strftime('%H:%M:%S')
         if trade_type == 'SIGNAL':
-            message = self._format_signal_message(signal, symbol)
+            message = self._format_signal_message(signal, symbol, now_str)
         elif trade_type == 'OPENED':
-            message = self._format_opened_message(signal, symbol, lot_size, result)
+            message = self._format_opened_message(signal, symbol, lot_size, result, now_str)
         elif trade_type == 'CLOSED':
-            message = self._format_closed_message(symbol, result)
+            message = self._format_closed_message(symbol, result, now_str)
         elif trade_type == 'MODIFIED':
-            message = self._format_modified_message(symbol, result)
+            message = self._format_modified_message(symbol, result, now_str)
         elif trade_type == 'ERROR':
-            message = self._format_error_message(symbol, result)
+            message = self._format_error_message(symbol, result, now_str)
         else:
             return
         
         self.send_message(message)
     
-    def _format_signal_message(self, signal: Dict, symbol: str) -> str:
+    def _format_signal_message(self, signal: Dict, symbol: str, now_str: str = None) -> str:
         """Format signal detection message"""
-        emoji = "📈" if signal['decision'] == 'BUY' else "📉" if signal['decision'] == 'SELL' else "⏸"
-        
-        message = f"""
-{emoji} <b>SIGNAL DETECTED</b>
-━━━━━━━━━━━━━━━━━━━
-📊 Symbol: <b>{symbol}</b>
-📍 Signal: <b>{signal['decision']}</b>
-💯 Confidence: <b>{signal.get('confidence', 0)}%</b>
-💰 Entry: <b>{signal.get('entry_price', 0):.5f}</b>
-🛑 Stop Loss: <b>{signal.get('stop_loss', 0):.5f}</b>
-🎯 Take Profit: <b>{signal.get('take_profit_1', 0):.5f}</b>
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-
-📝 <i>Reasoning: {signal.get('reasoning', 'N/A')[:200]}</i>
-        """
-        return message
+        return self._SIGNAL_TEMPLATE.format_map({
+            'emoji': self._SIGNAL_EMOJI.get(signal['decision'], "⏸"),
+            'symbol': symbol,
+            'decision': signal['decision'],
+            'confidence': signal.get('confidence', 0),
+            'entry': signal.get('entry_price', 0),
+            'sl': signal.get('stop_loss', 0),
+            'tp': signal.get('take_profit_1', 0),
+            'time': now_str or time.strftime('%H:%M:%S'),
+            'reasoning': signal.get('reasoning', 'N/A')[:200],
+        })
     
     def _format_opened_message(self, signal: Dict, symbol: str, 
-                               lot_size: float, result: Dict) -> str:
+                               lot_size: float, result: Dict, now_str: str = None) -> str:
         """Format trade opened message"""
-        emoji = "🟢" if signal['decision'] == 'BUY' else "🔴"
-        
+        sl = signal.get('stop_loss', 0)
+        tp = signal.get('take_profit_1', 0)
+
         # Calculate risk and reward
         if result and 'price' in result:
             entry = result['price']
-            sl = signal.get('stop_loss', 0)
-            tp = signal.get('take_profit_1', 0)
-            
-            risk_pips = abs(entry - sl) * 10000 if 'JPY' not in symbol else abs(entry - sl) * 100
-            reward_pips = abs(tp - entry) * 10000 if 'JPY' not in symbol else abs(tp - entry) * 100
+            pip_scale = _pip_scale(symbol)
+            risk_pips = abs(entry - sl) * pip_scale
+            reward_pips = abs(tp - entry) * pip_scale
             rr_ratio = reward_pips / risk_pips if risk_pips > 0 else 0
         else:
             risk_pips = reward_pips = rr_ratio = 0
         
-        message = f"""
-{emoji} <b>TRADE OPENED</b> {emoji}
-━━━━━━━━━━━━━━━━━━━
-📊 Symbol: <b>{symbol}</b>
-📍 Type: <b>{signal['decision']}</b>
-📦 Volume: <b>{lot_size} lots</b>
-💰 Entry: <b>{result.get('price', 0):.5f}</b>
-🛑 SL: <b>{signal.get('stop_loss', 0):.5f}</b> ({risk_pips:.1f} pips)
-🎯 TP: <b>{signal.get('take_profit_1', 0):.5f}</b> ({reward_pips:.1f} pips)
-📊 R:R Ratio: <b>1:{rr_ratio:.1f}</b>
-🎫 Ticket: <b>#{result.get('order', 'N/A')}</b>
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-
-💯 Confidence: {signal.get('confidence', 0)}%
-        """
-        return message
+        return self._OPENED_TEMPLATE.format_map({
+            'emoji': "🟢" if signal['decision'] == 'BUY' else "🔴",
+            'symbol': symbol,
+            'decision': signal['decision'],
+            'lot_size': lot_size,
+            'entry': result.get('price', 0),
+            'sl': sl,
+            'tp': tp,
+            'risk_pips': risk_pips,
+            'reward_pips': reward_pips,
+            'rr_ratio': rr_ratio,
+            'ticket': result.get('order', 'N/A'),
+            'time': now_str or time.strftime('%H:%M:%S'),
+            'confidence': signal.get('confidence', 0),
+        })
     
-    def _format_closed_message(self, symbol: str, result: Dict) -> str:
+    def _format_closed_message(self, symbol: str, result: Dict, now_str: str = None) -> str:
         """Format trade closed message"""
         profit = result.get('profit', 0)
-        emoji = "💰" if profit > 0 else "💸" if profit < 0 else "➖"
-        status_emoji = "✅" if profit > 0 else "❌" if profit < 0 else "⚪"
+        emoji, status_emoji = self._CLOSED_EMOJI[(profit > 0) - (profit < 0)]
         
-        message = f"""
-{status_emoji} <b>TRADE CLOSED</b> {status_emoji}
-━━━━━━━━━━━━━━━━━━━
-📊 Symbol: <b>{symbol}</b>
-💵 P/L: <b>${profit:.2f}</b> {emoji}
-📍 Close Price: <b>{result.get('price', 0):.5f}</b>
-🎫 Ticket: <b>#{result.get('order', 'N/A')}</b>
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-
-{self._get_pl_bar(profit)}
-        """
-        return message
+        return self._CLOSED_TEMPLATE.format_map({
+            'emoji': emoji,
+            'status_emoji': status_emoji,
+            'symbol': symbol,
+            'profit': profit,
+            'price': result.get('price', 0),
+            'ticket': result.get('order', 'N/A'),
+            'time': now_str or time.strftime('%H:%M:%S'),
+            'pl_bar': self._get_pl_bar(profit),
+        })
     
-    def _format_modified_message(self, symbol: str, result: Dict) -> str:
+    def _format_modified_message(self, symbol: str, result: Dict, now_str: str = None) -> str:
         """Format position modified message"""
-        message = f"""
-🔧 <b>POSITION MODIFIED</b>
-━━━━━━━━━━━━━━━━━━━
-📊 Symbol: <b>{symbol}</b>
-🛑 New SL: <b>{result.get('sl', 0):.5f}</b>
-🎯 New TP: <b>{result.get('tp', 0):.5f}</b>
-🎫 Ticket: <b>#{result.get('ticket', 'N/A')}</b>
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-📝 Trailing stop activated
-        """
-        return message
+        return self._MODIFIED_TEMPLATE.format_map({
+            'symbol': symbol,
+            'sl': result.get('sl', 0),
+            'tp': result.get('tp', 0),
+            'ticket': result.get('ticket', 'N/A'),
+            'time': now_str or time.strftime('%H:%M:%S'),
+        })
     
-    def _format_error_message(self, symbol: str, result: Dict) -> str:
+    def _format_error_message(self, symbol: str, result: Dict, now_str: str = None) -> str:
         """Format error message"""
-        message = f"""
-⚠️ <b>TRADE ERROR</b> ⚠️
-━━━━━━━━━━━━━━━━━━━
-📊 Symbol: <b>{symbol}</b>
-❌ Error: <b>{result.get('error', 'Unknown error')}</b>
-💬 Details: {result.get('comment', 'N/A')}
-⏰ Time: {datetime.now().strftime('%H:%M:%S')}
-        """
-        return message
+        return self._ERROR_TEMPLATE.format_map({
+            'symbol': symbol,
+            'error': result.get('error', 'Unknown error'),
+            'comment': result.get('comment', 'N/A'),
+            'time': now_str or time.strftime('%H:%M:%S'),
+        })
     
     def _get_pl_bar(self, profit: float) -> str:
         """Create visual P/L bar"""
         if profit > 0:
             bars = min(int(profit / 10), 10)
-            return "🟩" * bars + "⬜" * (10 - bars) + f" (+${profit:.2f})"
+            return f"{self._GREEN_BARS[bars]} (+${profit:.2f})"
         elif profit < 0:
             bars = min(int(abs(profit) / 10), 10)
-            return "🟥" * bars + "⬜" * (10 - bars) + f" (-${abs(profit):.2f})"
+            return f"{self._RED_BARS[bars]} (-${abs(profit):.2f})"
         else:
-            return "⬜" * 10 + " ($0.00)"
+            return f"{self._GREEN_BARS[0]} ($0.00)"
     
     def send_account_summary(self, account_info, positions):
         """Send daily account summary"""
         if not self.enabled:
             return
         
-        total_profit = sum(pos.profit for pos in positions) if positions else 0
+        position_count = len(positions) if positions else 0
+        profits = np.fromiter((pos.profit for pos in positions), dtype=np.float64,
+                              count=position_count) if positions else np.empty(0)
+        total_profit = profits.sum()
         profit_emoji = "📈" if total_profit > 0 else "📉" if total_profit < 0 else "➖"
         
         message = f"""
@@ -257,18 +603,26 @@ class TelegramNotifier:
 💳 Free Margin: <b>${account_info.margin_free:.2f}</b>
 📊 Margin Level: <b>{account_info.margin_level:.2f}%</b>
 
-📍 <b>Open Positions: {len(positions) if positions else 0}</b>
+📍 <b>Open Positions: {position_count}</b>
 """
         
         if positions:
             message += "━━━━━━━━━━━━━━━━━━━\n"
-            for pos in positions[:5]:  # Show max 5 positions
+            # Show max 5 positions - the largest by absolute P/L
+            magnitude = np.abs(profits)
+            if position_count > 5:
+                top = np.argpartition(-magnitude, 5)[:5]
+            else:
+                top = np.arange(position_count)
+            top = top[np.argsort(-magnitude[top], kind='stable')]
+            for index in top:
+                pos = positions[index]
                 emoji = "🟢" if pos.type == 0 else "🔴"
                 pl_emoji = "💰" if pos.profit > 0 else "💸"
                 message += f"{emoji} {pos.symbol}: {pos.volume} lots | P/L: ${pos.profit:.2f} {pl_emoji}\n"
             
-            if len(positions) > 5:
-                message += f"... and {len(positions) - 5} more positions\n"
+            if position_count > 5:
+                message += f"... and {position_count - 5} more positions\n"
         
         message += f"""
 ━━━━━━━━━━━━━━━━━━━
@@ -319,20 +673,51 @@ class TelegramNotifier:
         
         self.send_message(message)
 
+def _xpath_has_class(name: str) -> str:
+    """XPath predicate matching one whole token of the class attribute"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
 class ForexFactoryNews:
     """Forex Factory News Calendar Integration"""
+
+    _UPCOMING_TTL = 30  # seconds a filtered upcoming-news list is reused
+    _REFRESH_INTERVAL = 1800  # background calendar refresh (seconds)
+    _RETRY_INTERVAL = 60  # retry sooner after a failed refresh
+    _FIRST_SNAPSHOT_TIMEOUT = 15  # max wait for the initial calendar at startup
+
+    # Compiled XPath selectors for the calendar page
+    _TABLE_XPATH = etree.XPath(f"//table[{_xpath_has_class('calendar__table')}]")
+    # Event rows only - day separators and "no events" rows carry no calendar cells
+    _ROW_XPATH = etree.XPath(
+        f".//tr[{_xpath_has_class('calendar__row')}"
+        f" and not({_xpath_has_class('calendar__row--day-breaker')})"
+        f" and not({_xpath_has_class('calendar__row--no-data')})]"
+    )
+    _CELL_XPATHS = {
+        name: etree.XPath(f"./td[{_xpath_has_class('calendar__' + name)}]")
+        for name in ('date', 'time', 'currency', 'impact', 'event', 'actual', 'forecast', 'previous')
+    }
     
     def __init__(self, telegram_notifier: TelegramNotifier = None):
         self.telegram = telegram_notifier
         self.base_url = "https://www.forexfactory.com"
         self.calendar_url = f"{self.base_url}/calendar"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Pooled async client on the shared loop; daily pages are fetched concurrently
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
+            timeout=10.0,
+        )
         self.high_impact_news = []
         self.last_update = None
-        self.bangkok_tz = pytz.timezone('Asia/Bangkok')
+        self._upcoming_cache = {}  # hours_ahead -> (computed_at, events)
+        self.bangkok_tz = timezone(timedelta(hours=7), 'Asia/Bangkok')  # Fixed GMT+7, no DST - no pytz lookup per now()
+        self._est_tz = pytz.timezone('US/Eastern')  # ForexFactory calendar times
+
+        # Per-day calendar cache with conditional-GET validators, persisted to disk
+        self.cache_path = os.path.join(os.path.expanduser('~'), '.mt5bot', 'ff_cache.pkl')
+        self._cache_lock = threading.Lock()
+        self._calendar_cache = self._load_calendar_cache()
         
         # Currency mapping for news filtering
         self.currency_mapping = {
@@ -346,6 +731,17 @@ class ForexFactoryNews:
             'NZD': ['NZDUSD', 'EURNZD', 'GBPNZD', 'NZDJPY', 'AUDNZD', 'NZDCAD', 'NZDCHF'],
             'CNY': ['USDCNH', 'CNHJPY'],
         }
+        self.currency_mapping = {currency: frozenset(symbols)
+                                 for currency, symbols in self.currency_mapping.items()}
+
+        # Reverse index: symbol -> currencies whose news affect it
+        symbol_to_currencies = defaultdict(set)
+        for currency, symbols in self.currency_mapping.items():
+            for symbol in symbols:
+                symbol_to_currencies[symbol].add(currency)
+        self._symbol_to_currencies = {symbol: frozenset(currencies)
+                                      for symbol, currencies in symbol_to_currencies.items()}
+        self._affected_symbols_memo = {}  # (currencies, limit) -> symbols for news alerts
         
         # High impact event keywords
         self.high_impact_keywords = [
@@ -355,74 +751,83 @@ class ForexFactoryNews:
             'Unemployment', 'Core PCE', 'PPI', 'ISM', 'Consumer Confidence'
         ]
         
+        # Today's calendar is refreshed on the shared loop; readers only see the snapshot
+        self._snapshot_ready = threading.Event()
+        self._refresh_future = _run_in_background(self._refresh_loop())
+        
         logger.info("ForexFactory news monitor initialized")
     
-    def fetch_calendar(self, date: datetime = None) -> List[Dict]:
-        """Fetch news calendar from ForexFactory"""
+    def fetch_calendar(self, date: datetime = None, max_age: float = 0) -> List[Dict]:
+        """Fetch news calendar from ForexFactory
+
+        max_age: seconds a cached day is reused without any request (0 = always revalidate)
+        """
+        if date is None:
+            date = datetime.now()
+        try:
+            return _run_in_background(self._fetch_day(date, max_age)).result(timeout=30)
+        except Exception as e:
+            logger.error(f"Error fetching ForexFactory calendar: {e}")
+            return []
+
+    def close(self):
+        """Stop the background refresh and close the HTTP client"""
+        self._refresh_future.cancel()
+        try:
+            _run_in_background(self.client.aclose()).result(timeout=5)
+        except Exception as e:
+            logger.debug(f"ForexFactory client close error: {e}")
+
+    async def _refresh_loop(self):
+        """Periodically swap in a fresh copy of today's calendar"""
+        while True:
+            previous_update = self.last_update
+            events = await self._fetch_day(datetime.now())
+            # Plain reference swaps - readers on other threads never see a partial update
+            self.high_impact_news = events
+            self._upcoming_cache = {}
+            self._snapshot_ready.set()
+
+            failed = self.last_update is previous_update
+            await asyncio.sleep(self._RETRY_INTERVAL if failed else self._REFRESH_INTERVAL)
+
+    async def _fetch_day(self, date: datetime, max_age: float = 0) -> List[Dict]:
+        """Fetch and parse one calendar day (runs on the shared loop)"""
         try:
-            if date is None:
-                date = datetime.now()
-            
             # Format date for URL (e.g., 'dec19.2024')
             date_str = date.strftime('%b%d.%Y').lower()
             url = f"{self.calendar_url}?day={date_str}"
-            
-            response = self.session.get(url, timeout=10)
+
+            cached = self._calendar_cache.get(date_str)
+            if cached and max_age and time.time() - cached['fetched_at'] < max_age:
+                return cached['events']
+
+            # Conditional GET - unchanged pages come back as 304 without a body
+            headers = {}
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+
+            response = await self.client.get(url, headers=headers)
+            if response.status_code == 304 and cached:
+                cached['fetched_at'] = time.time()
+                self.last_update = datetime.now()
+                return cached['events']
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # Find calendar table
-            calendar_table = soup.find('table', class_='calendar__table')
-            if not calendar_table:
-                logger.warning("Calendar table not found")
-                return []
-            
-            news_events = []
-            rows = calendar_table.find_all('tr', class_='calendar__row')
-            
-            current_date = None
-            for row in rows:
-                # Check if this is a date row
-                date_cell = row.find('td', class_='calendar__date')
-                if date_cell:
-                    date_text = date_cell.get_text(strip=True)
-                    if date_text:
-                        current_date = self._parse_date(date_text)
-                
-                # Extract event data
-                time_cell = row.find('td', class_='calendar__time')
-                currency_cell = row.find('td', class_='calendar__currency')
-                impact_cell = row.find('td', class_='calendar__impact')
-                event_cell = row.find('td', class_='calendar__event')
-                actual_cell = row.find('td', class_='calendar__actual')
-                forecast_cell = row.find('td', class_='calendar__forecast')
-                previous_cell = row.find('td', class_='calendar__previous')
-                
-                if time_cell and currency_cell and event_cell:
-                    event_time = time_cell.get_text(strip=True)
-                    
-                    # Skip if no specific time
-                    if event_time in ['', 'All Day', 'Tentative']:
-                        continue
-                    
-                    # Parse impact level
-                    impact = self._parse_impact(impact_cell) if impact_cell else 'low'
-                    
-                    event = {
-                        'date': current_date,
-                        'time': event_time,
-                        'datetime': self._combine_datetime(current_date, event_time),
-                        'currency': currency_cell.get_text(strip=True),
-                        'impact': impact,
-                        'event': event_cell.get_text(strip=True),
-                        'actual': actual_cell.get_text(strip=True) if actual_cell else '',
-                        'forecast': forecast_cell.get_text(strip=True) if forecast_cell else '',
-                        'previous': previous_cell.get_text(strip=True) if previous_cell else ''
-                    }
-                    
-                    news_events.append(event)
-            
+
+            # Parse off the event loop
+            news_events = await asyncio.get_running_loop().run_in_executor(
+                None, self._parse_calendar, response.content)
+
+            self._store_calendar_day(date_str, {
+                'events': news_events,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+            })
+
             self.last_update = datetime.now()
             logger.info(f"Fetched {len(news_events)} news events")
             
@@ -431,6 +836,100 @@ class ForexFactoryNews:
         except Exception as e:
             logger.error(f"Error fetching ForexFactory calendar: {e}")
             return []
+
+    def _parse_calendar(self, content: bytes) -> List[Dict]:
+        """Parse calendar page HTML into event dicts"""
+        tree = lxml.html.fromstring(content)
+        
+        # Find calendar table
+        tables = self._TABLE_XPATH(tree)
+        if not tables:
+            logger.warning("Calendar table not found")
+            return []
+        
+        news_events = []
+        cell_xpaths = self._CELL_XPATHS
+        
+        current_date = None
+        def first(name, row):
+            found = cell_xpaths[name](row)
+            return found[0] if found else None
+
+        for row in self._ROW_XPATH(tables[0]):
+            # Check if this is a date row
+            date_cell = first('date', row)
+            if date_cell is not None:
+                date_text = self._cell_text(date_cell)
+                if date_text:
+                    current_date = self._parse_date(date_text)
+            
+            # Extract event data - the remaining cells are only looked up for event rows
+            time_cell = first('time', row)
+            currency_cell = first('currency', row)
+            event_cell = first('event', row)
+            
+            if time_cell is not None and currency_cell is not None and event_cell is not None:
+                event_time = self._cell_text(time_cell)
+                
+                # Skip if no specific time
+                if event_time in ['', 'All Day', 'Tentative']:
+                    continue
+                
+                impact_cell = first('impact', row)
+                actual_cell = first('actual', row)
+                forecast_cell = first('forecast', row)
+                previous_cell = first('previous', row)
+
+                # Parse impact level
+                impact = self._parse_impact(impact_cell) if impact_cell is not None else 'low'
+                
+                event = {
+                    'date': current_date,
+                    'time': event_time,
+                    'datetime': self._combine_datetime(current_date, event_time),
+                    'currency': self._cell_text(currency_cell),
+                    'impact': impact,
+                    'event': self._cell_text(event_cell),
+                    'actual': self._cell_text(actual_cell) if actual_cell is not None else '',
+                    'forecast': self._cell_text(forecast_cell) if forecast_cell is not None else '',
+                    'previous': self._cell_text(previous_cell) if previous_cell is not None else ''
+                }
+                
+                news_events.append(event)
+
+        return news_events
+
+    @staticmethod
+    def _cell_text(cell) -> str:
+        """Concatenate stripped text fragments of a cell"""
+        return ''.join(text.strip() for text in cell.itertext())
+
+    def _load_calendar_cache(self) -> Dict[str, Dict]:
+        """Load persisted calendar cache from disk"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable calendar cache: {e}")
+            return {}
+
+    def _store_calendar_day(self, date_str: str, entry: Dict, keep_days: int = 14):
+        """Cache one day and persist to disk, dropping entries older than keep_days"""
+        cutoff = time.time() - keep_days * 86400
+        with self._cache_lock:
+            cache = {k: v for k, v in self._calendar_cache.items() if v['fetched_at'] >= cutoff}
+            cache[date_str] = entry
+            self._calendar_cache = cache
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                tmp_path = f"{self.cache_path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(self._calendar_cache, f)
+                os.replace(tmp_path, self.cache_path)
+            except Exception as e:
+                logger.warning(f"Failed to save calendar cache: {e}")
     
     def _parse_date(self, date_text: str) -> str:
         """Parse date from ForexFactory format"""
@@ -446,16 +945,19 @@ class ForexFactoryNews:
     
     def _parse_impact(self, impact_cell) -> str:
         """Parse impact level from cell"""
-        if not impact_cell:
+        if impact_cell is None:
             return 'low'
         
-        # Check for impact icons or classes
-        impact_spans = impact_cell.find_all('span', class_='icon')
-        
-        # Count filled icons (high impact usually has 3 red icons)
-        red_count = len([s for s in impact_spans if 'icon--red' in s.get('class', [])])
-        orange_count = len([s for s in impact_spans if 'icon--orange' in s.get('class', [])])
-        yellow_count = len([s for s in impact_spans if 'icon--yellow' in s.get('class', [])])
+        # Count filled icons in one pass over the spans (high impact usually has 3 red icons)
+        red_count = orange_count = 0
+        for span in impact_cell.iter('span'):
+            classes = span.get('class', '').split()
+            if 'icon' not in classes:
+                continue
+            if 'icon--red' in classes:
+                red_count += 1
+            if 'icon--orange' in classes:
+                orange_count += 1
         
         if red_count >= 2:
             return 'high'
@@ -474,19 +976,15 @@ class ForexFactoryNews:
             # Combine date and time
             datetime_str = f"{date_str} {time_str}"
             
-            # Try different formats
-            for fmt in ['%Y-%m-%d %I:%M%p', '%Y-%m-%d %H:%M']:
-                try:
-                    dt = datetime.strptime(datetime_str, fmt)
-                    # Assume EST timezone for ForexFactory
-                    est_tz = pytz.timezone('US/Eastern')
-                    dt = est_tz.localize(dt)
-                    # Convert to Bangkok time
-                    return dt.astimezone(self.bangkok_tz)
-                except:
-                    continue
-            
-            return None
+            # Pick the format from the am/pm suffix instead of trial parsing
+            fmt = '%Y-%m-%d %I:%M%p' if time_str[-2:].lower() in ('am', 'pm') else '%Y-%m-%d %H:%M'
+            try:
+                dt = datetime.strptime(datetime_str, fmt)
+            except ValueError:
+                return None
+
+            # Assume EST timezone for ForexFactory, convert to Bangkok time
+            return self._est_tz.localize(dt).astimezone(self.bangkok_tz)
             
         except Exception as e:
             logger.debug(f"Error parsing datetime: {e}")
@@ -494,19 +992,26 @@ class ForexFactoryNews:
     
     def get_upcoming_high_impact(self, hours_ahead: int = 1) -> List[Dict]:
         """Get upcoming high impact news within specified hours"""
+        # News is refreshed in the background; only the very first call waits for it
+        if not self._snapshot_ready.is_set():
+            self._snapshot_ready.wait(timeout=self._FIRST_SNAPSHOT_TIMEOUT)
+
+        # Reuse the filtered list for a short while - called once per symbol per scan
+        upcoming_cache = self._upcoming_cache
+        cached = upcoming_cache.get(hours_ahead)
+        if cached and time.monotonic() - cached[0] < self._UPCOMING_TTL:
+            return cached[1]
+
         now = datetime.now(self.bangkok_tz)
         future_time = now + timedelta(hours=hours_ahead)
         
-        # Update news if needed (every 30 minutes)
-        if not self.last_update or (datetime.now() - self.last_update).seconds > 1800:
-            self.high_impact_news = self.fetch_calendar()
-        
         upcoming = []
         for event in self.high_impact_news:
             if event['impact'] == 'high' and event['datetime']:
                 if now <= event['datetime'] <= future_time:
                     upcoming.append(event)
         
+        upcoming_cache[hours_ahead] = (time.monotonic(), upcoming)
         return upcoming
     
     def check_news_for_symbols(self, symbols: List[str], hours_ahead: int = 1) -> Dict[str, List]:
@@ -518,11 +1023,10 @@ class ForexFactoryNews:
             currency = event['currency']
             
             # Find affected symbols
-            affected = []
-            if currency in self.currency_mapping:
-                for symbol in symbols:
-                    if symbol in self.currency_mapping[currency]:
-                        affected.append(symbol)
+            currency_symbols = self.currency_mapping.get(currency)
+            if not currency_symbols:
+                continue
+            affected = [symbol for symbol in symbols if symbol in currency_symbols]
             
             # Add to affected symbols dict
             for symbol in affected:
@@ -534,27 +1038,36 @@ class ForexFactoryNews:
     
     def should_avoid_trading(self, symbol: str, minutes_before: int = 30, minutes_after: int = 30) -> Tuple[bool, str]:
         """Check if should avoid trading due to news"""
+        return self.should_avoid_trading_batch([symbol], minutes_before, minutes_after)[symbol]
+
+    def should_avoid_trading_batch(self, symbols: List[str], minutes_before: int = 30,
+                                   minutes_after: int = 30) -> Dict[str, Tuple[bool, str]]:
+        """Check news avoidance for many symbols with one pass over the upcoming events"""
         now = datetime.now(self.bangkok_tz)
-        
-        # Get news for the symbol
         upcoming_news = self.get_upcoming_high_impact(hours_ahead=2)
-        
-        # Check which currencies affect this symbol
-        affecting_currencies = []
-        for currency, symbols in self.currency_mapping.items():
-            if symbol in symbols:
-                affecting_currencies.append(currency)
-        
-        for event in upcoming_news:
-            if event['currency'] in affecting_currencies and event['datetime']:
-                # Calculate time difference
-                time_until = (event['datetime'] - now).total_seconds() / 60
-                
-                # Check if within avoidance window
-                if -minutes_after <= time_until <= minutes_before:
-                    return True, f"High impact news: {event['event']} ({event['currency']}) in {int(time_until)} min"
-        
-        return False, ""
+
+        # First event inside the avoidance window per currency (keeps list order)
+        first_by_currency = {}
+        for index, event in enumerate(upcoming_news):
+            if event['currency'] in first_by_currency or not event['datetime']:
+                continue
+            # Calculate time difference
+            time_until = (event['datetime'] - now).total_seconds() / 60
+            if -minutes_after <= time_until <= minutes_before:
+                first_by_currency[event['currency']] = (index, event, time_until)
+
+        results = {}
+        for symbol in symbols:
+            hits = [first_by_currency[currency]
+                    for currency in self._currencies_for(symbol)
+                    if currency in first_by_currency]
+            if hits:
+                _, event, time_until = min(hits, key=lambda hit: hit[0])
+                results[symbol] = (True, f"High impact news: {event['event']} ({event['currency']}) in {int(time_until)} min")
+            else:
+                results[symbol] = (False, "")
+
+        return results
     
     def send_news_alert(self, hours_ahead: int = 1):
         """Send upcoming news alert to Telegram"""
@@ -571,8 +1084,9 @@ class ForexFactoryNews:
 ━━━━━━━━━━━━━━━━━━━
 """
         
+        now = datetime.now(self.bangkok_tz)
         for event in upcoming_news[:5]:  # Limit to 5 events
-            time_until = (event['datetime'] - datetime.now(self.bangkok_tz)).total_seconds() / 60
+            time_until = (event['datetime'] - now).total_seconds() / 60
             
             if event['impact'] == 'high':
                 impact_emoji = "🔴"
@@ -589,16 +1103,13 @@ class ForexFactoryNews:
 ━━━━━━━━━━━━━━━━━━━"""
         
         # Add affected symbols
-        all_symbols = set()
-        for event in upcoming_news:
-            if event['currency'] in self.currency_mapping:
-                all_symbols.update(self.currency_mapping[event['currency']])
+        affected_symbols = self._affected_symbols(frozenset(event['currency'] for event in upcoming_news))
         
-        if all_symbols:
+        if affected_symbols:
             message += f"""
 
 ⚠️ <b>Affected Symbols:</b>
-{', '.join(sorted(all_symbols)[:10])}
+{', '.join(affected_symbols)}
 
 💡 <b>Recommendation:</b> 
 Avoid new trades 30min before and after
@@ -606,14 +1117,31 @@ Avoid new trades 30min before and after
         
         self.telegram.send_message(message)
     
+    def _currencies_for(self, symbol: str) -> frozenset:
+        """Currencies whose news affect a symbol - broker suffixes (EURUSDc, EURUSD.pro) are ignored"""
+        return self._symbol_to_currencies.get(_base_symbol(symbol), frozenset())
+
+    def _affected_symbols(self, currencies: frozenset, limit: int = 10) -> Tuple[str, ...]:
+        """First symbols (alphabetically) affected by news in any of the currencies, memoized"""
+        key = (currencies, limit)
+        symbols = self._affected_symbols_memo.get(key)
+        if symbols is None:
+            union = frozenset().union(*(self.currency_mapping.get(currency, ()) for currency in currencies))
+            symbols = tuple(heapq.nsmallest(limit, union))
+            self._affected_symbols_memo[key] = symbols
+        return symbols
+
     def get_weekly_calendar(self) -> pd.DataFrame:
         """Get weekly calendar for analysis"""
         events = []
         
-        # Fetch for next 7 days
-        for i in range(7):
-            date = datetime.now() + timedelta(days=i)
-            daily_events = self.fetch_calendar(date)
+        # Fetch next 7 days concurrently
+        try:
+            weekly = _run_in_background(self._fetch_week()).result(timeout=60)
+        except Exception as e:
+            logger.error(f"Error fetching ForexFactory weekly calendar: {e}")
+            weekly = []
+        for daily_events in weekly:
             events.extend(daily_events)
         
         # Convert to DataFrame for analysis
@@ -624,6 +1152,15 @@ Avoid new trades 30min before and after
         
         return pd.DataFrame()
 
+    async def _fetch_week(self) -> List[List[Dict]]:
+        """Fetch the next 7 days in parallel"""
+        now = datetime.now()
+        # Today is revalidated, upcoming days reuse a recent cached copy
+        return await asyncio.gather(*(
+            self._fetch_day(now + timedelta(days=i), max_age=0 if i == 0 else 6 * 3600)
+            for i in range(7)
+        ))
+
 class MT5Connection:
     """MT5 Connection Manager - Supports both login and no-login modes"""
 
@@ -695,12 +1232,21 @@ class MT5Connection:
 class MarketDataMT5:
     """ดึงและวิเคราะห์ข้อมูลตลาดจาก MT5 with caching"""
 
-    def __init__(self):
+    _FIB_RATIOS = np.array([0.236, 0.382, 0.5, 0.618])
+    _TAIL_BARS = 3  # Bars re-read when extending cached rates
+    ANALYSIS_BARS = 100  # Bars per timeframe for analysis (and the H1 ATR shared with trailing stops)
+
+    def __init__(self, symbol_cache: 'SymbolInfoCache' = None):
         self.symbols = ['EURUSDc', 'XAUUSDc']  # Broker symbols with 'c' suffix
+        self.symbol_cache = symbol_cache or SymbolInfoCache()  # Quotes for the analysis snapshot
         # Performance cache
-        self._cache = {}
+        self._cache = OrderedDict()  # LRU of raw rates
+        self._cache_size = 64
         self._cache_duration = 60  # Cache for 60 seconds
-        self._indicator_cache = {}  # Cache calculated indicators
+        self._indicator_cache = OrderedDict()  # LRU of calculated indicators
+        self._indicator_cache_size = 64
+        self._cache_lock = threading.Lock()  # Timeframes load on worker threads
+        self._last_atr = {}  # symbol -> (hour number, H1 ATR) from the latest analysis
         
     def get_rates(self, symbol: str, timeframe: int, count: int) -> pd.DataFrame:
         """ดึงข้อมูลราคาจาก MT5 with caching"""
@@ -709,147 +1255,243 @@ class MarketDataMT5:
         current_time = time.time()
 
         # Check cache
-        if cache_key in self._cache:
-            cached_data, cache_time = self._cache[cache_key]
-            if current_time - cache_time < self._cache_duration:
-                return cached_data
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None and current_time - cached[1] < self._cache_duration:
+                self._cache.move_to_end(cache_key)
+                return cached[0]
+
+        # Expired entry: fetch only the newest bars and splice them on; full fetch if that leaves a gap
+        df = self._extend_rates(symbol, timeframe, count, cached[0]) if cached is not None else None
+        if df is None:
+            rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+
+            if rates is None:
+                logger.error(f"Failed to get rates for {symbol}")
+                return pd.DataFrame()
+
+            df = self._rates_to_frame(rates)
+
+        # Cache the data - shared with callers, which never modify it in place
+        with self._cache_lock:
+            self._cache[cache_key] = (df, current_time)
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
 
-        # Fetch new data
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+        return df
+    
+    def _extend_rates(self, symbol: str, timeframe: int, count: int,
+                      previous: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Previous bars plus the latest few, or None when the new bars do not overlap the old ones"""
+        if previous.empty:
+            return None
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, self._TAIL_BARS)
+        if rates is None or not len(rates):
+            return None
+        tail = self._rates_to_frame(rates)
+        if tail.index[0] > previous.index[-1]:  # More new bars than we re-read - gap
+            return None
+        # Re-read bars replace their cached copies (the last cached bar was still forming)
+        return pd.concat([previous[previous.index < tail.index[0]], tail]).iloc[-count:]
+
+    @staticmethod
+    def _rates_to_frame(rates: np.ndarray) -> pd.DataFrame:
+        """DataFrame indexed by bar time from an MT5 rates array"""
+        # Build the time index straight from the epoch seconds (no extra column + set_index)
+        index = pd.DatetimeIndex(rates['time'].astype('datetime64[s]'), name='time')
+        columns = {field: rates[field] for field in rates.dtype.names if field != 'time'}
+        # Tick volume fits in int32 (halves the column); prices stay float64 - TA-Lib needs
+        # float64 input and float32 cannot hold 5-digit quotes exactly
+        columns['tick_volume'] = columns['tick_volume'].astype(np.int32)
+        return pd.DataFrame(columns, index=index)
+
+    def calculate_indicators(self, df: pd.DataFrame, symbol: str = None,
+                             timeframe: int = None) -> pd.DataFrame:
+        """คำนวณ Technical Indicators with caching (cache needs symbol and timeframe)"""
+        if df.empty:
+            return df
 
-        if rates is None:
-            logger.error(f"Failed to get rates for {symbol}")
-            return pd.DataFrame()
+        # Key on the last bar and its close so an updating bar is recalculated
+        cache_key = None
+        if symbol is not None and timeframe is not None:
+            cache_key = (symbol, timeframe, len(df), df.index[-1].value, df['close'].iat[-1])
+            with self._cache_lock:
+                cached = self._indicator_cache.get(cache_key)
+                if cached is not None:
+                    self._indicator_cache.move_to_end(cache_key)
+                    return cached
+
+        close = df['close']
+        columns = {
+            # Price changes
+            'change_1h': close.pct_change(1) * 100,
+            'change_4h': close.pct_change(4) * 100,
+            'change_24h': close.pct_change(24) * 100,
+        }
+        if talib is not None:
+            columns.update(self._talib_indicators(df))
+        else:
+            columns.update(self._ta_indicators(df))
+        # ATR for stop loss calculation - same backend and window as calculate_atr's other callers
+        columns['atr'] = self.calculate_atr(df)
 
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        df.set_index('time', inplace=True)
+        # Support and Resistance
+        if bn is not None:
+            columns['support'] = bn.move_min(df['low'].to_numpy(dtype=np.float64), window=20)
+            columns['resistance'] = bn.move_max(df['high'].to_numpy(dtype=np.float64), window=20)
+        else:
+            columns['support'] = df['low'].rolling(window=20).min()
+            columns['resistance'] = df['high'].rolling(window=20).max()
+
+        # Attach all indicator columns in one step instead of one copy per column
+        df = pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
 
-        # Cache the data
-        self._cache[cache_key] = (df.copy(), current_time)
+        # Cache the calculated indicators (callers treat them as read-only)
+        if cache_key is not None:
+            with self._cache_lock:
+                self._indicator_cache[cache_key] = df
+                if len(self._indicator_cache) > self._indicator_cache_size:
+                    self._indicator_cache.popitem(last=False)
 
         return df
     
-    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """คำนวณ Technical Indicators with caching"""
-        if df.empty:
-            return df
+    def _talib_indicators(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Indicator columns computed with TA-Lib on raw float64 arrays"""
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
 
-        # Create cache key from dataframe hash
-        df_hash = pd.util.hash_pandas_object(df.iloc[-1]).values[0]
-        cache_key = f"indicators_{df_hash}"
+        macd, macd_signal, macd_diff = talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9)
+        bb_upper, bb_middle, bb_lower = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2)
+        # Fast stochastic matches ta's StochasticOscillator (%K 14, %D 3)
+        stoch_k, stoch_d = talib.STOCHF(high, low, close, fastk_period=14, fastd_period=3)
 
-        # Check indicator cache
-        if cache_key in self._indicator_cache:
-            return self._indicator_cache[cache_key]
-            
-        # Price changes
-        df['change_1h'] = df['close'].pct_change(1) * 100
-        df['change_4h'] = df['close'].pct_change(4) * 100
-        df['change_24h'] = df['close'].pct_change(24) * 100
-        
-        # Moving Averages
-        df['sma_20'] = ta.trend.sma_indicator(df['close'], window=20)
-        df['sma_50'] = ta.trend.sma_indicator(df['close'], window=50)
-        df['ema_12'] = ta.trend.ema_indicator(df['close'], window=12)
-        df['ema_26'] = ta.trend.ema_indicator(df['close'], window=26)
-        
-        # RSI
-        df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
-        
-        # MACD
+        return {
+            'sma_20': talib.SMA(close, timeperiod=20),
+            'sma_50': talib.SMA(close, timeperiod=50),
+            'ema_12': talib.EMA(close, timeperiod=12),
+            'ema_26': talib.EMA(close, timeperiod=26),
+            'rsi': talib.RSI(close, timeperiod=14),
+            'macd': macd,
+            'macd_signal': macd_signal,
+            'macd_diff': macd_diff,
+            'bb_upper': bb_upper,
+            'bb_middle': bb_middle,
+            'bb_lower': bb_lower,
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+        }
+
+    def _ta_indicators(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Indicator columns computed with the pure-Python ta library"""
         macd = ta.trend.MACD(df['close'])
-        df['macd'] = macd.macd()
-        df['macd_signal'] = macd.macd_signal()
-        df['macd_diff'] = macd.macd_diff()
-        
-        # Bollinger Bands
         bb = ta.volatility.BollingerBands(df['close'], window=20, window_dev=2)
-        df['bb_upper'] = bb.bollinger_hband()
-        df['bb_middle'] = bb.bollinger_mavg()
-        df['bb_lower'] = bb.bollinger_lband()
-        
-        # ATR for stop loss calculation
-        df['atr'] = ta.volatility.AverageTrueRange(df['high'], df['low'], df['close'], window=14).average_true_range()
-        
-        # Stochastic
         stoch = ta.momentum.StochasticOscillator(df['high'], df['low'], df['close'])
-        df['stoch_k'] = stoch.stoch()
-        df['stoch_d'] = stoch.stoch_signal()
-        
-        # Support and Resistance
-        df['support'] = df['low'].rolling(window=20).min()
-        df['resistance'] = df['high'].rolling(window=20).max()
 
-        # Cache the calculated indicators
-        self._indicator_cache[cache_key] = df.copy()
+        return {
+            'sma_20': ta.trend.sma_indicator(df['close'], window=20),
+            'sma_50': ta.trend.sma_indicator(df['close'], window=50),
+            'ema_12': ta.trend.ema_indicator(df['close'], window=12),
+            'ema_26': ta.trend.ema_indicator(df['close'], window=26),
+            'rsi': ta.momentum.RSIIndicator(df['close'], window=14).rsi(),
+            'macd': macd.macd(),
+            'macd_signal': macd.macd_signal(),
+            'macd_diff': macd.macd_diff(),
+            'bb_upper': bb.bollinger_hband(),
+            'bb_middle': bb.bollinger_mavg(),
+            'bb_lower': bb.bollinger_lband(),
+            'stoch_k': stoch.stoch(),
+            'stoch_d': stoch.stoch_signal(),
+        }
 
-        # Clean old cache entries if too many
-        if len(self._indicator_cache) > 100:
-            # Remove oldest 50 entries
-            keys_to_remove = list(self._indicator_cache.keys())[:50]
-            for key in keys_to_remove:
-                del self._indicator_cache[key]
+    def calculate_atr(self, df: pd.DataFrame, window: int = 14) -> np.ndarray:
+        """ATR column (TA-Lib when installed, else ta) - also used by calculate_indicators"""
+        if talib is not None:
+            return talib.ATR(df['high'].to_numpy(dtype=np.float64), df['low'].to_numpy(dtype=np.float64),
+                             df['close'].to_numpy(dtype=np.float64), timeperiod=window)
+        return ta.volatility.AverageTrueRange(df['high'], df['low'], df['close'],
+                                              window=window).average_true_range().to_numpy()
+
+    def get_last_atr(self, symbol: str, bar: int) -> Optional[float]:
+        """H1 ATR from the latest market analysis if it was taken during hour `bar`"""
+        cached = self._last_atr.get(symbol)
+        return cached[1] if cached is not None and cached[0] == bar else None
+
+    def _load_timeframe(self, symbol: str, timeframe: int, count: int) -> pd.DataFrame:
+        """Fetch rates and calculate indicators for one timeframe"""
+        df = self.get_rates(symbol, timeframe, count)
+        return self.calculate_indicators(df, symbol, timeframe) if not df.empty else df
+
+    def latest_bar_time(self, symbol: str) -> Optional[int]:
+        """Open time of the newest M5 bar - read through the rates cache the analysis loads its M5 frame from"""
+        df = self.get_rates(symbol, mt5.TIMEFRAME_M5, self.ANALYSIS_BARS)
+        return int(df.index[-1].timestamp()) if not df.empty else None
 
-        return df
-    
     def get_market_analysis(self, symbol: str) -> Dict:
         """Multi-timeframe market analysis with advanced indicators"""
-        # Multi-timeframe analysis (D1, H4, H1, M15, M5)
-        df_d1 = self.get_rates(symbol, mt5.TIMEFRAME_D1, 100)
-        df_h4 = self.get_rates(symbol, mt5.TIMEFRAME_H4, 100)
-        df_h1 = self.get_rates(symbol, mt5.TIMEFRAME_H1, 100)
-        df_m15 = self.get_rates(symbol, mt5.TIMEFRAME_M15, 100)
-        df_m5 = self.get_rates(symbol, mt5.TIMEFRAME_M5, 100)
-
-        # Calculate indicators for all timeframes
-        df_d1 = self.calculate_indicators(df_d1) if not df_d1.empty else df_d1
-        df_h4 = self.calculate_indicators(df_h4) if not df_h4.empty else df_h4
-        df_h1 = self.calculate_indicators(df_h1) if not df_h1.empty else df_h1
-        df_m15 = self.calculate_indicators(df_m15) if not df_m15.empty else df_m15
-        df_m5 = self.calculate_indicators(df_m5) if not df_m5.empty else df_m5
+        # Multi-timeframe analysis (D1, H4, H1, M15, M5) - fetch and calculate concurrently
+        futures = {
+            timeframe: _MARKET_DATA_POOL.submit(self._load_timeframe, symbol, timeframe, self.ANALYSIS_BARS)
+            for timeframe in (mt5.TIMEFRAME_D1, mt5.TIMEFRAME_H4, mt5.TIMEFRAME_H1,
+                              mt5.TIMEFRAME_M15, mt5.TIMEFRAME_M5)
+        }
+        df_d1 = futures[mt5.TIMEFRAME_D1].result()
+        df_h4 = futures[mt5.TIMEFRAME_H4].result()
+        df_h1 = futures[mt5.TIMEFRAME_H1].result()
+        df_m15 = futures[mt5.TIMEFRAME_M15].result()
+        df_m5 = futures[mt5.TIMEFRAME_M5].result()
 
         if df_h1.empty or df_m15.empty:
             return {}
 
-        latest_d1 = df_d1.iloc[-1] if not df_d1.empty else None
-        latest_h4 = df_h4.iloc[-1] if not df_h4.empty else None
+        # Column views shared by all helpers; full row only for the many H1 fields below
+        f_d1, f_h4, f_h1, f_m15, f_m5 = (_make_frame(df) for df in (df_d1, df_h4, df_h1, df_m15, df_m5))
         latest_h1 = df_h1.iloc[-1]
-        latest_m15 = df_m15.iloc[-1]
-        latest_m5 = df_m5.iloc[-1] if not df_m5.empty else None
 
-        # Get symbol info
-        symbol_info = mt5.symbol_info(symbol)
+        # Share H1 ATR with position management for the rest of this hour
+        self._last_atr[symbol] = (int(time.time()) // 3600, float(f_h1.atr[-1]))
+
+        # Get symbol info - the snapshot run() refreshed for this check
+        symbol_info = self.symbol_cache.get(symbol)
+        if symbol_info is None:
+            return {}
+
+        # Rolling-window scalars used more than once - only the last window is needed
+        vol_ma20 = f_h1.tick_volume[-20:].mean() if len(f_h1.tick_volume) >= 20 else np.nan
+        session_high = f_h1.high[-24:].max() if len(f_h1.high) >= 24 else np.nan
+        session_low = f_h1.low[-24:].min() if len(f_h1.low) >= 24 else np.nan
 
         # Calculate advanced metrics
-        market_structure = self._analyze_market_structure(df_h1)
-        volume_profile = self._calculate_volume_profile(df_h1)
-        key_levels = self._identify_key_levels(df_d1, df_h4, df_h1)
-        momentum_score = self._calculate_momentum_score(df_h1, df_m15)
+        market_structure = self._analyze_market_structure(f_h1)
+        volume_profile = self._calculate_volume_profile(f_h1)
+        key_levels = self._identify_key_levels(f_d1, f_h4, f_h1)
+        momentum_score = self._calculate_momentum_score(f_h1, f_m15, vol_ma20)
 
         return {
             'symbol': symbol,
             'current_price': symbol_info.bid,
             'ask': symbol_info.ask,
             'spread': symbol_info.spread,
+            'digits': symbol_info.digits,
 
             # Multi-timeframe data
-            'trend_d1': self._determine_trend(df_d1) if not df_d1.empty else 'UNKNOWN',
-            'trend_h4': self._determine_trend(df_h4) if not df_h4.empty else 'UNKNOWN',
-            'trend_h1': self._determine_trend(df_h1),
-            'trend_m15': self._determine_trend(df_m15),
+            'trend_d1': self._determine_trend(f_d1) if f_d1 is not None else 'UNKNOWN',
+            'trend_h4': self._determine_trend(f_h4) if f_h4 is not None else 'UNKNOWN',
+            'trend_h1': self._determine_trend(f_h1),
+            'trend_m15': self._determine_trend(f_m15),
 
             # RSI multi-timeframe
-            'rsi_d1': latest_d1['rsi'] if latest_d1 is not None else 50,
-            'rsi_h4': latest_h4['rsi'] if latest_h4 is not None else 50,
-            'rsi_h1': latest_h1['rsi'],
-            'rsi_m15': latest_m15['rsi'],
-            'rsi_m5': latest_m5['rsi'] if latest_m5 is not None else 50,
+            'rsi_d1': f_d1.rsi[-1] if f_d1 is not None else 50,
+            'rsi_h4': f_h4.rsi[-1] if f_h4 is not None else 50,
+            'rsi_h1': f_h1.rsi[-1],
+            'rsi_m15': f_m15.rsi[-1],
+            'rsi_m5': f_m5.rsi[-1] if f_m5 is not None else 50,
 
             # MACD signals
-            'macd_signal_h4': 'BUY' if latest_h4 is not None and latest_h4['macd'] > latest_h4['macd_signal'] else 'SELL',
-            'macd_signal_h1': 'BUY' if latest_h1['macd'] > latest_h1['macd_signal'] else 'SELL',
-            'macd_signal_m15': 'BUY' if latest_m15['macd'] > latest_m15['macd_signal'] else 'SELL',
+            'macd_signal_h4': 'BUY' if f_h4 is not None and f_h4.macd[-1] > f_h4.macd_signal[-1] else 'SELL',
+            'macd_signal_h1': 'BUY' if f_h1.macd[-1] > f_h1.macd_signal[-1] else 'SELL',
+            'macd_signal_m15': 'BUY' if f_m15.macd[-1] > f_m15.macd_signal[-1] else 'SELL',
 
             # Price changes
             'change_1h': latest_h1['change_1h'],
@@ -858,10 +1500,10 @@ class MarketDataMT5:
 
             # Volume and volatility
             'volume': latest_h1['tick_volume'],
-            'volume_ma': df_h1['tick_volume'].rolling(20).mean().iloc[-1],
-            'volume_ratio': latest_h1['tick_volume'] / df_h1['tick_volume'].rolling(20).mean().iloc[-1],
-            'atr': latest_h1['atr'],
-            'atr_h4': latest_h4['atr'] if latest_h4 is not None else latest_h1['atr'],
+            'volume_ma': vol_ma20,
+            'volume_ratio': latest_h1['tick_volume'] / vol_ma20,
+            'atr': f_h1.atr[-1],
+            'atr_h4': f_h4.atr[-1] if f_h4 is not None else f_h1.atr[-1],
 
             # Support/Resistance
             'support_h1': latest_h1['support'],
@@ -877,9 +1519,10 @@ class MarketDataMT5:
             'momentum_score': momentum_score,
 
             # Session and timing
+            'bar_time': int(df_m5.index[-1].timestamp()) if not df_m5.empty else None,  # Latest M5 bar open
             'market_session': self._get_market_session(),
-            'session_high': df_h1['high'].rolling(24).max().iloc[-1],  # Session high
-            'session_low': df_h1['low'].rolling(24).min().iloc[-1],    # Session low
+            'session_high': session_high,  # Session high
+            'session_low': session_low,    # Session low
         }
     
     def _calculate_bb_position(self, data) -> str:
@@ -898,230 +1541,167 @@ class MarketDataMT5:
             else:
                 return 'MIDDLE'
     
-    def _determine_trend(self, df: pd.DataFrame) -> str:
+    def _determine_trend(self, frame: Frame) -> str:
         """กำหนด trend จาก moving averages"""
-        latest = df.iloc[-1]
-        if latest['sma_20'] > latest['sma_50'] and latest['close'] > latest['sma_20']:
+        sma_20, sma_50, close = frame.sma_20[-1], frame.sma_50[-1], frame.close[-1]
+        if sma_20 > sma_50 and close > sma_20:
             return 'UPTREND'
-        elif latest['sma_20'] < latest['sma_50'] and latest['close'] < latest['sma_20']:
+        elif sma_20 < sma_50 and close < sma_20:
             return 'DOWNTREND'
         else:
             return 'SIDEWAYS'
     
     def _get_market_session(self) -> str:
         """ระบุ market session ปัจจุบัน"""
-        now = datetime.now()
-        hour = now.hour
-
-        if 7 <= hour < 16:  # Asian Session (Bangkok time)
-            return 'ASIAN'
-        elif 14 <= hour < 23:  # European Session
-            return 'EUROPEAN'
-        elif 20 <= hour or hour < 5:  # US Session
-            return 'US'
-        else:
-            return 'INTER_SESSION'
+        return _SESSION_BY_HOUR[datetime.now().hour]
 
-    def _analyze_market_structure(self, df: pd.DataFrame) -> Dict:
+    def _analyze_market_structure(self, frame: Optional[Frame]) -> Dict:
         """Analyze market structure (Higher Highs/Lows)"""
-        if df.empty or len(df) < 20:
+        if frame is None or len(frame.close) < 20:
             return {'type': 'UNKNOWN', 'strength': 0}
 
-        # Find swing points
-        highs = df['high'].rolling(5).max()
-        lows = df['low'].rolling(5).min()
-
-        # Check last 3 swing points
-        recent_highs = highs.tail(15).dropna()
-        recent_lows = lows.tail(15).dropna()
+        # Find swing points - 5-bar windows over the last 20 bars only
+        window_view = np.lib.stride_tricks.sliding_window_view
+        recent_highs = window_view(frame.high[-20:], 5).max(axis=1)
+        recent_lows = window_view(frame.low[-20:], 5).min(axis=1)
 
         # Determine structure
-        if len(recent_highs) > 2 and len(recent_lows) > 2:
-            if recent_highs.iloc[-1] > recent_highs.iloc[-2] and recent_lows.iloc[-1] > recent_lows.iloc[-2]:
-                return {'type': 'BULLISH', 'strength': 0.8}
-            elif recent_highs.iloc[-1] < recent_highs.iloc[-2] and recent_lows.iloc[-1] < recent_lows.iloc[-2]:
-                return {'type': 'BEARISH', 'strength': 0.8}
+        if recent_highs[-1] > recent_highs[-2] and recent_lows[-1] > recent_lows[-2]:
+            return {'type': 'BULLISH', 'strength': 0.8}
+        elif recent_highs[-1] < recent_highs[-2] and recent_lows[-1] < recent_lows[-2]:
+            return {'type': 'BEARISH', 'strength': 0.8}
 
         return {'type': 'RANGING', 'strength': 0.5}
 
-    def _calculate_volume_profile(self, df: pd.DataFrame) -> Dict:
+    def _calculate_volume_profile(self, frame: Optional[Frame]) -> Dict:
         """Calculate volume profile for price levels"""
-        if df.empty:
+        if frame is None:
             return {'poc': 0, 'high_volume_zone': []}
 
-        # Price levels
-        price_range = df['close'].max() - df['close'].min()
-        levels = 20
-        step = price_range / levels
+        closes = frame.close
+        low, high = closes.min(), closes.max()
+        if high == low:
+            # Flat prices - no distribution to profile
+            return {'poc': low, 'high_volume_zone': []}
 
-        volume_at_price = {}
-        for i in range(levels):
-            level = df['close'].min() + (i * step)
-            mask = (df['close'] >= level) & (df['close'] < level + step)
-            volume_at_price[level] = df.loc[mask, 'tick_volume'].sum()
+        # Volume at 20 price levels in one pass
+        volume_at_price, edges = np.histogram(closes, bins=20, range=(low, high),
+                                              weights=frame.tick_volume.astype(np.float64))
+        levels = edges[:-1]
 
         # Point of Control (POC) - highest volume price
-        poc = max(volume_at_price, key=volume_at_price.get)
+        poc = float(levels[volume_at_price.argmax()])
 
         return {
             'poc': poc,
-            'high_volume_zone': [k for k, v in volume_at_price.items() if v > np.mean(list(volume_at_price.values()))]
+            'high_volume_zone': levels[volume_at_price > volume_at_price.mean()].tolist()
         }
 
-    def _identify_key_levels(self, df_d1: pd.DataFrame, df_h4: pd.DataFrame, df_h1: pd.DataFrame) -> List[float]:
+    def _identify_key_levels(self, f_d1: Optional[Frame], f_h4: Optional[Frame],
+                             f_h1: Optional[Frame]) -> List[float]:
         """Identify key support/resistance levels from multiple timeframes"""
         levels = []
 
-        # Daily levels
-        if not df_d1.empty and len(df_d1) > 20:
-            levels.append(df_d1['high'].rolling(20).max().iloc[-1])
-            levels.append(df_d1['low'].rolling(20).min().iloc[-1])
-            levels.append(df_d1['close'].rolling(50).mean().iloc[-1])
+        # Daily levels (last-window scalars straight from the arrays)
+        if f_d1 is not None and len(f_d1.close) > 20:
+            levels.append(f_d1.high[-20:].max())
+            levels.append(f_d1.low[-20:].min())
+            if len(f_d1.close) >= 50:
+                levels.append(f_d1.close[-50:].mean())
 
         # H4 levels
-        if not df_h4.empty and len(df_h4) > 20:
-            levels.append(df_h4['high'].rolling(20).max().iloc[-1])
-            levels.append(df_h4['low'].rolling(20).min().iloc[-1])
+        if f_h4 is not None and len(f_h4.close) > 20:
+            levels.append(f_h4.high[-20:].max())
+            levels.append(f_h4.low[-20:].min())
 
         # H1 levels
-        if not df_h1.empty and len(df_h1) > 20:
-            # Fibonacci levels
-            high = df_h1['high'].max()
-            low = df_h1['low'].min()
-            diff = high - low
-            levels.extend([
-                low + diff * 0.236,  # 23.6%
-                low + diff * 0.382,  # 38.2%
-                low + diff * 0.5,    # 50%
-                low + diff * 0.618,  # 61.8%
-            ])
-
-        # Remove duplicates and sort
-        levels = sorted(list(set([round(l, 5) for l in levels if l > 0])))
-
-        return levels
-
-    def _calculate_momentum_score(self, df_h1: pd.DataFrame, df_m15: pd.DataFrame) -> float:
+        if f_h1 is not None and len(f_h1.close) > 20:
+            # Fibonacci levels (23.6%, 38.2%, 50%, 61.8%)
+            high = f_h1.high.max()
+            low = f_h1.low.min()
+            levels.extend((self._FIB_RATIOS * (high - low) + low).tolist())
+
+        # Remove duplicates and sort - np.unique sorts the rounded values in one call
+        levels = np.round(np.asarray(levels, dtype=np.float64), 5)
+        return np.unique(levels[levels > 0]).tolist()
+
+    def _calculate_momentum_score(self, f_h1: Optional[Frame], f_m15: Optional[Frame],
+                                  vol_ma: float = None) -> float:
         """Calculate overall momentum score (0-100)"""
-        score = 50  # Neutral
-
-        if df_h1.empty or df_m15.empty:
-            return score
+        if f_h1 is None or f_m15 is None:
+            return 50  # Neutral
 
-        latest_h1 = df_h1.iloc[-1]
-        latest_m15 = df_m15.iloc[-1]
-
-        # RSI momentum
-        if latest_h1['rsi'] > 70:
-            score += 15
-        elif latest_h1['rsi'] < 30:
-            score -= 15
-        else:
-            score += (latest_h1['rsi'] - 50) * 0.3
-
-        # MACD momentum
-        if latest_h1['macd'] > latest_h1['macd_signal']:
-            score += 10
-        else:
-            score -= 10
-
-        # Price vs MA
-        if latest_h1['close'] > latest_h1['sma_20']:
-            score += 10
-        else:
-            score -= 10
-
-        # Volume momentum
-        vol_ma = df_h1['tick_volume'].rolling(20).mean().iloc[-1]
-        if latest_h1['tick_volume'] > vol_ma * 1.5:
-            score += 10
-        elif latest_h1['tick_volume'] < vol_ma * 0.5:
-            score -= 10
+        if vol_ma is None:
+            vol_ma = f_h1.tick_volume[-20:].mean() if len(f_h1.tick_volume) >= 20 else np.nan
 
-        # Clamp between 0-100
-        score = max(0, min(100, score))
-
-        return score
+        # Plain floats only - the kernel is numba-compiled when numba is installed
+        return _momentum_score_kernel(
+            float(f_h1.rsi[-1]), float(f_h1.macd[-1]), float(f_h1.macd_signal[-1]),
+            float(f_h1.close[-1]), float(f_h1.sma_20[-1]),
+            float(f_h1.tick_volume[-1]), float(vol_ma),
+        )
 
 class GeminiTradingAI:
     """Gemini AI for Trading Decisions"""
     
-    def __init__(self, api_key: str, news_checker: 'ForexFactoryNews' = None):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-pro')
-        self.news_checker = news_checker
-        
-    def analyze_and_decide(self, market_data: Dict) -> Dict:
-        """วิเคราะห์และตัดสินใจเทรดด้วย Gemini"""
-        
-        # Check for upcoming news if news checker is available
-        news_warning = ""
-        if self.news_checker:
-            avoid_trading, reason = self.news_checker.should_avoid_trading(
-                market_data['symbol'], 
-                minutes_before=30, 
-                minutes_after=30
-            )
-            if avoid_trading:
-                news_warning = f"\nNEWS WARNING: {reason}\nConsider avoiding new trades or reduce position size."
-        
-        prompt = f"""
-        You are an elite forex trader with 20+ years experience analyzing {market_data['symbol']} using multi-timeframe analysis.
+    # Prompt body is built once; analyze_and_decide only fills in the values
+    _PROMPT_TEMPLATE = """
+        You are an elite forex trader with 20+ years experience analyzing {symbol} using multi-timeframe analysis.
 
         MULTI-TIMEFRAME ANALYSIS:
-        Symbol: {market_data['symbol']}
-        Current Price: {market_data['current_price']:.5f}
-        Spread: {market_data['spread']} points
+        Symbol: {symbol}
+        Current Price: {current_price:.5f}
+        Spread: {spread} points
 
         TREND ALIGNMENT (D1 → H4 → H1 → M15):
-        - Daily Trend: {market_data.get('trend_d1', 'UNKNOWN')}
-        - H4 Trend: {market_data.get('trend_h4', 'UNKNOWN')}
-        - H1 Trend: {market_data.get('trend_h1', 'UNKNOWN')}
-        - M15 Trend: {market_data.get('trend_m15', 'UNKNOWN')}
+        - Daily Trend: {trend_d1}
+        - H4 Trend: {trend_h4}
+        - H1 Trend: {trend_h1}
+        - M15 Trend: {trend_m15}
 
         RSI DIVERGENCE CHECK:
-        - RSI D1: {market_data.get('rsi_d1', 50):.1f}
-        - RSI H4: {market_data.get('rsi_h4', 50):.1f}
-        - RSI H1: {market_data.get('rsi_h1', 50):.1f}
-        - RSI M15: {market_data.get('rsi_m15', 50):.1f}
-        - RSI M5: {market_data.get('rsi_m5', 50):.1f}
+        - RSI D1: {rsi_d1:.1f}
+        - RSI H4: {rsi_h4:.1f}
+        - RSI H1: {rsi_h1:.1f}
+        - RSI M15: {rsi_m15:.1f}
+        - RSI M5: {rsi_m5:.1f}
 
         MOMENTUM ANALYSIS:
-        - MACD H4: {market_data.get('macd_signal_h4', 'NEUTRAL')}
-        - MACD H1: {market_data.get('macd_signal_h1', 'NEUTRAL')}
-        - MACD M15: {market_data.get('macd_signal_m15', 'NEUTRAL')}
-        - Momentum Score: {market_data.get('momentum_score', 50):.0f}/100
+        - MACD H4: {macd_signal_h4}
+        - MACD H1: {macd_signal_h1}
+        - MACD M15: {macd_signal_m15}
+        - Momentum Score: {momentum_score:.0f}/100
 
         MARKET STRUCTURE:
-        - Structure Type: {market_data.get('market_structure', {}).get('type', 'UNKNOWN')}
-        - Structure Strength: {market_data.get('market_structure', {}).get('strength', 0)*100:.0f}%
-        - Session High: {market_data.get('session_high', 0):.5f}
-        - Session Low: {market_data.get('session_low', 0):.5f}
+        - Structure Type: {structure_type}
+        - Structure Strength: {structure_strength_pct:.0f}%
+        - Session High: {session_high:.5f}
+        - Session Low: {session_low:.5f}
 
         VOLUME ANALYSIS:
-        - Current Volume: {market_data.get('volume', 0)}
-        - Volume MA: {market_data.get('volume_ma', 0):.0f}
-        - Volume Ratio: {market_data.get('volume_ratio', 1):.2f}x
-        - Point of Control: {market_data.get('volume_profile', {}).get('poc', 0):.5f}
+        - Current Volume: {volume}
+        - Volume MA: {volume_ma:.0f}
+        - Volume Ratio: {volume_ratio:.2f}x
+        - Point of Control: {poc:.5f}
 
         KEY LEVELS:
-        - Support H1: {market_data.get('support_h1', 0):.5f}
-        - Resistance H1: {market_data.get('resistance_h1', 0):.5f}
-        - Fibonacci Levels: {market_data.get('key_levels', [])}
+        - Support H1: {support_h1:.5f}
+        - Resistance H1: {resistance_h1:.5f}
+        - Fibonacci Levels: {key_levels}
 
         VOLATILITY:
-        - ATR H1: {market_data.get('atr', 0):.5f}
-        - ATR H4: {market_data.get('atr_h4', 0):.5f}
-        - Bollinger Position: {market_data.get('bb_position', 'MIDDLE')}
+        - ATR H1: {atr:.5f}
+        - ATR H4: {atr_h4:.5f}
+        - Bollinger Position: {bb_position}
 
         PRICE ACTION:
-        - 1H Change: {market_data.get('change_1h', 0):.2f}%
-        - 4H Change: {market_data.get('change_4h', 0):.2f}%
-        - 24H Change: {market_data.get('change_24h', 0):.2f}%
-        - Stochastic: K={market_data.get('stoch_k', 50):.1f}, D={market_data.get('stoch_d', 50):.1f}
+        - 1H Change: {change_1h:.2f}%
+        - 4H Change: {change_4h:.2f}%
+        - 24H Change: {change_24h:.2f}%
+        - Stochastic: K={stoch_k:.1f}, D={stoch_d:.1f}
 
         SESSION & TIMING:
-        - Current Session: {market_data.get('market_session', 'UNKNOWN')}
+        - Current Session: {market_session}
         {news_warning}
 
         ADVANCED TRADING RULES:
@@ -1169,18 +1749,145 @@ class GeminiTradingAI:
 
         Only suggest trades with 60%+ confluence. If news warning present, require 80%+ confidence.
         """
+
+    # Fallbacks for fields missing from market_data
+    _PROMPT_DEFAULTS = {
+        'trend_d1': 'UNKNOWN',
+        'trend_h4': 'UNKNOWN',
+        'trend_h1': 'UNKNOWN',
+        'trend_m15': 'UNKNOWN',
+        'rsi_d1': 50,
+        'rsi_h4': 50,
+        'rsi_h1': 50,
+        'rsi_m15': 50,
+        'rsi_m5': 50,
+        'macd_signal_h4': 'NEUTRAL',
+        'macd_signal_h1': 'NEUTRAL',
+        'macd_signal_m15': 'NEUTRAL',
+        'momentum_score': 50,
+        'session_high': 0,
+        'session_low': 0,
+        'volume': 0,
+        'volume_ma': 0,
+        'volume_ratio': 1,
+        'support_h1': 0,
+        'resistance_h1': 0,
+        'key_levels': [],
+        'atr': 0,
+        'atr_h4': 0,
+        'bb_position': 'MIDDLE',
+        'change_1h': 0,
+        'change_4h': 0,
+        'change_24h': 0,
+        'stoch_k': 50,
+        'stoch_d': 50,
+        'market_session': 'UNKNOWN',
+    }
+
+    _RESPONSE_CACHE_SIZE = 64
+
+    def __init__(self, api_key: str, news_checker: 'ForexFactoryNews' = None):
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel('gemini-1.5-pro')
+        self.news_checker = news_checker
+        self._prompt_templates = {}  # digits -> template with prices at the symbol's precision
+        # LRU of prompt -> Gemini response; the prompt is the rounded feature set, so an
+        # unchanged market (same bar, same formatted values) is answered without a request
+        self._response_cache = OrderedDict()
         
+    def analyze_and_decide(self, market_data: Dict) -> Dict:
+        """วิเคราะห์และตัดสินใจเทรดด้วย Gemini"""
+        return self.analyze_batch([market_data])[0]
+
+    def analyze_batch(self, market_data_list: List[Dict], timeout: float = 60) -> List[Dict]:
+        """Analyze several symbols with concurrent Gemini requests, decisions in input order"""
+        if not market_data_list:
+            return []
+
+        # Prompts (including the news check) are built here, off the event loop
+        prompts = [self._build_prompt(market_data) for market_data in market_data_list]
+
+        # Only prompts not answered before go to Gemini
+        responses = []
+        for prompt in prompts:
+            response = self._response_cache.get(prompt)
+            if response is not None:
+                self._response_cache.move_to_end(prompt)
+            responses.append(response)
+        missing = [i for i, response in enumerate(responses) if response is None]
+
+        if missing:
+            try:
+                fresh = _run_in_background(
+                    self._generate_all([prompts[i] for i in missing])).result(timeout=timeout)
+            except Exception as e:
+                logger.error(f"Error in Gemini analysis: {e}")
+                fresh = [e] * len(missing)
+
+            for i, response in zip(missing, fresh):
+                responses[i] = response
+                if not isinstance(response, BaseException):  # Never cache failures
+                    self._response_cache[prompts[i]] = response
+                    if len(self._response_cache) > self._RESPONSE_CACHE_SIZE:
+                        self._response_cache.popitem(last=False)
+
+        return [self._parse_decision(response, market_data)
+                for response, market_data in zip(responses, market_data_list)]
+
+    async def _generate_all(self, prompts: List[str]) -> List:
+        """Send all prompts concurrently; failures come back as exceptions"""
+        return await asyncio.gather(
+            *(self.model.generate_content_async(prompt) for prompt in prompts),
+            return_exceptions=True,
+        )
+
+    def _build_prompt(self, market_data: Dict) -> str:
+        """Fill the prompt template for one symbol"""
+        # Check for upcoming news if news checker is available
+        news_warning = ""
+        news_flag = market_data.get('news_flag')  # Precomputed by TradingBot.run's batch news check
+        if news_flag is None and self.news_checker:
+            news_flag = self.news_checker.should_avoid_trading(
+                market_data['symbol'], 
+                minutes_before=30, 
+                minutes_after=30
+            )
+        if news_flag:
+            avoid_trading, reason = news_flag
+            if avoid_trading:
+                news_warning = f"\nNEWS WARNING: {reason}\nConsider avoiding new trades or reduce position size."
+        
+        # Flat context: defaults, then market data, then nested fields pulled up
+        market_structure = market_data.get('market_structure') or {}
+        ctx = {**self._PROMPT_DEFAULTS, **market_data}
+        ctx['structure_type'] = market_structure.get('type', 'UNKNOWN')
+        ctx['structure_strength_pct'] = market_structure.get('strength', 0) * 100
+        ctx['poc'] = (market_data.get('volume_profile') or {}).get('poc', 0)
+        ctx['news_warning'] = news_warning
+
+        # Prices at the symbol's own precision - extra digits only cost prompt tokens
+        digits = market_data.get('digits', 5)
+        template = self._prompt_templates.get(digits)
+        if template is None:
+            template = self._prompt_templates[digits] = self._PROMPT_TEMPLATE.replace(':.5f}', f':.{digits}f}}')
+        ctx['key_levels'] = [round(level, digits) for level in ctx['key_levels']]
+        return template.format_map(ctx)
+
+    def _parse_decision(self, response, market_data: Dict) -> Dict:
+        """Turn a Gemini response (or the exception it raised) into a validated decision"""
         try:
-            response = self.model.generate_content(prompt)
+            if isinstance(response, BaseException):
+                raise response
+
+            # Extract JSON from response (```json fence, plain ``` fence or bare JSON)
+            text = response.text
+            _, fence, rest = text.partition('```json')
+            if not fence:
+                _, fence, rest = text.partition('```')
+            json_str = rest.partition('```')[0] if fence else text
             
-            # Extract JSON from response
-            json_str = response.text
-            if '```json' in json_str:
-                json_str = json_str.split('```json')[1].split('```')[0]
-            elif '```' in json_str:
-                json_str = json_str.split('```')[1].split('```')[0]
-            
-            decision = json.loads(json_str.strip())
+            json_str = json_str.strip()
+            decision = _json_loads(json_str)
             
             # Validate decision
             if self._validate_decision(decision, market_data):
@@ -1191,7 +1898,8 @@ class GeminiTradingAI:
                 
         except Exception as e:
             logger.error(f"Error in Gemini analysis: {e}")
-            return {"decision": "HOLD", "confidence": 0}
+            # 'error' marks a HOLD that is not a real decision - the bar is retried on the next check
+            return {"decision": "HOLD", "confidence": 0, "error": str(e)}
     
     def _validate_decision(self, decision: Dict, market_data: Dict) -> bool:
         """ตรวจสอบความถูกต้องของการตัดสินใจ"""
@@ -1219,11 +1927,91 @@ class GeminiTradingAI:
         
         return True
 
+# Asset classes with reduced risk per trade
+_INDEX_SYMBOLS = frozenset({'US30', 'US500', 'NAS100', 'DE30', 'UK100', 'JP225'})
+_OIL_SYMBOLS = frozenset({'USOIL', 'UKOIL', 'WTI', 'BRENT'})
+_CRYPTO_SYMBOLS = frozenset({'BTCUSD', 'ETHUSD'})
+
+# Symbol-specific lot caps
+_MAX_LOT_BY_SYMBOL = MappingProxyType({
+    'XAUUSD': 0.5,    # Max 0.5 lot for gold
+    'XAUEUR': 0.5,
+    'US30': 0.3,      # Max 0.3 lot for indices
+    'US500': 0.3,
+    'NAS100': 0.3,
+    'BTCUSD': 0.1,    # Max 0.1 lot for crypto
+    'ETHUSD': 0.1,
+    'USOIL': 0.3,     # Max 0.3 lot for oil
+    'UKOIL': 0.3
+})
+
+class SymbolInfoCache:
+    """Short-lived cache of mt5.symbol_info snapshots (one terminal call per symbol per TTL)"""
+
+    FIELDS = ('point', 'digits', 'trade_contract_size', 'trade_tick_value', 'trade_tick_size',
+              'volume_min', 'volume_max', 'volume_step', 'visible', 'trade_mode',
+              'bid', 'ask', 'spread')
+
+    def __init__(self, ttl: float = 5.0):
+        self.ttl = ttl
+        self._entries = {}  # symbol -> (fetched_at, SimpleNamespace)
+
+    def get(self, symbol: str) -> Optional[SimpleNamespace]:
+        """Cached symbol info, or None if the symbol is unknown"""
+        now = time.monotonic()
+        entry = self._entries.get(symbol)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+
+        info = mt5.symbol_info(symbol)
+        if info is None:
+            return None
+        return self._store(symbol, info, now)
+
+    def refresh(self, symbols: List[str]):
+        """Refresh many symbols with one mt5.symbols_get call instead of one symbol_info each"""
+        if not symbols or not hasattr(mt5, 'symbols_get'):
+            return
+        infos = mt5.symbols_get(group=','.join(symbols))
+        if not infos:
+            return
+        now = time.monotonic()
+        wanted = set(symbols)
+        for info in infos:
+            if info.name in wanted:
+                self._store(info.name, info, now)
+
+    def _store(self, symbol: str, info, now: float) -> SimpleNamespace:
+        """Snapshot the fields we use from one SymbolInfo and cache it"""
+        snapshot = SimpleNamespace(**{field: getattr(info, field) for field in self.FIELDS})
+        # Per-symbol constants for lot sizing, so the hot path avoids repeated divisions
+        if 'XAU' in symbol or 'GOLD' in symbol:
+            snapshot.pip_value = info.point * 10  # Gold pip value
+        elif '_' not in symbol and len(symbol) == 6:  # Forex pairs
+            snapshot.pip_value = info.point * 10
+        else:  # Indices, commodities
+            snapshot.pip_value = info.point
+        # lot = risk / (pips * tick_value) = risk * pip_per_tick_value / price distance
+        snapshot.pip_per_tick_value = (snapshot.pip_value / info.trade_tick_value
+                                       if info.trade_tick_value else None)
+        snapshot.inv_volume_step = 1.0 / info.volume_step if info.volume_step else None
+        self._entries[symbol] = (now, snapshot)
+        return snapshot
+
+    def invalidate(self, symbol: str = None):
+        """Drop one symbol (or everything) so the next get() refetches"""
+        if symbol is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(symbol, None)
+
 class RiskManager:
     """Risk Management System"""
     
-    def __init__(self, initial_balance: float, config: Dict = None):
-        self.initial_balance = initial_balance
+    def __init__(self, initial_balance: float, config: Dict = None,
+                 symbol_cache: SymbolInfoCache = None):
+        self._initial_balance = initial_balance
+        self.symbol_cache = symbol_cache or SymbolInfoCache()
         
         # Default risk parameters (Conservative)
         default_config = {
@@ -1247,13 +2035,21 @@ class RiskManager:
             default_config.update(config)
         
         self.max_risk_per_trade = default_config['max_risk_per_trade']
-        self.max_daily_loss = default_config['max_daily_loss']
-        self.max_weekly_loss = default_config['max_weekly_loss']
+        self._max_daily_loss = default_config['max_daily_loss']
+        self._max_weekly_loss = default_config['max_weekly_loss']
         self.max_open_trades = default_config['max_open_trades']
         self.max_correlation_trades = default_config['max_correlation_trades']
         self.risk_free_profit_lock = default_config['risk_free_profit_lock']
         self.trailing_stop_activation = default_config['trailing_stop_activation']
         self.position_size_by_confidence = default_config['position_size_by_confidence']
+
+        # Confidence tiers presorted for bisect lookups
+        confidence_tiers = sorted(self.position_size_by_confidence.items())
+        self._confidence_thresholds = [threshold for threshold, _ in confidence_tiers]
+        self._confidence_multipliers = [multiplier for _, multiplier in confidence_tiers]
+
+        # Loss limits baked into a closure - can_open_trade's fast path reads no attributes
+        self._within_loss_limits = self._build_loss_gate()
         
         self.daily_pnl = 0.0
         self.weekly_pnl = 0.0
@@ -1265,13 +2061,21 @@ class RiskManager:
             'OIL': ['USOIL', 'UKOIL', 'WTI', 'BRENT'],
             'INDICES': ['US30', 'US500', 'NAS100', 'DE30', 'UK100', 'JP225']
         }
+
+        # Correlated neighbours: symbol -> every symbol sharing at least one group with it (itself included)
+        neighbours = defaultdict(set)
+        for symbols in self.correlation_groups.values():
+            for group_symbol in symbols:
+                neighbours[group_symbol].update(symbols)
+        self._correlated_symbols = {group_symbol: frozenset(group)
+                                    for group_symbol, group in neighbours.items()}
         
     def calculate_lot_size(self, symbol: str, entry: float, stop_loss: float, 
                           confidence: int, account_balance: float) -> float:
         """คำนวณขนาด Lot ตามความเสี่ยง"""
         
         # Get symbol info
-        symbol_info = mt5.symbol_info(symbol)
+        symbol_info = self.symbol_cache.get(symbol)
         if not symbol_info:
             return 0.0
         
@@ -1279,72 +2083,51 @@ class RiskManager:
         risk_amount = account_balance * self.max_risk_per_trade
         
         # Adjust by confidence level using tiered system
-        confidence_multiplier = 0.25  # Default minimum
-        for conf_threshold, multiplier in sorted(self.position_size_by_confidence.items(), reverse=True):
-            if confidence >= conf_threshold:
-                confidence_multiplier = multiplier
-                break
+        tier = bisect.bisect_right(self._confidence_thresholds, confidence) - 1
+        confidence_multiplier = self._confidence_multipliers[tier] if tier >= 0 else 0.25  # Default minimum
         
         risk_amount *= confidence_multiplier
         
         # Further adjust risk for different asset classes
         if 'XAU' in symbol or 'GOLD' in symbol:
             risk_amount *= 0.7  # ลด risk สำหรับทองคำ (volatility สูง)
-        elif symbol in ['US30', 'US500', 'NAS100', 'DE30', 'UK100', 'JP225']:
+        elif symbol in _INDEX_SYMBOLS:
             risk_amount *= 0.8  # ลด risk สำหรับ indices
-        elif symbol in ['USOIL', 'UKOIL', 'WTI', 'BRENT']:
+        elif symbol in _OIL_SYMBOLS:
             risk_amount *= 0.6  # ลด risk สำหรับน้ำมัน (volatility สูงมาก)
-        elif symbol in ['BTCUSD', 'ETHUSD']:
+        elif symbol in _CRYPTO_SYMBOLS:
             risk_amount *= 0.5  # ลด risk สำหรับ crypto
         
-        # Calculate pip difference
-        point = symbol_info.point
-        if 'XAU' in symbol or 'GOLD' in symbol:
-            pip_value = point * 10  # Gold pip value
-        elif '_' not in symbol and len(symbol) == 6:  # Forex pairs
-            pip_value = point * 10
-        else:  # Indices, commodities
-            pip_value = point
-        
-        pip_difference = abs(entry - stop_loss) / pip_value
-        
-        # Calculate lot size
-        contract_size = symbol_info.trade_contract_size
-        tick_value = symbol_info.trade_tick_value
-        
-        if pip_difference > 0:
-            lot_size = risk_amount / (pip_difference * tick_value)
+        # Calculate lot size (pip value / tick value precomputed in the symbol cache)
+        if symbol_info.pip_per_tick_value is None:
+            logger.warning(f"No tick value for {symbol}, cannot size position")
+            return 0.0
+
+        price_difference = abs(entry - stop_loss)
+        if price_difference > 0:
+            lot_size = risk_amount * symbol_info.pip_per_tick_value / price_difference
         else:
             lot_size = symbol_info.volume_min
         
         # Apply symbol-specific limits
-        max_lot_by_symbol = {
-            'XAUUSD': 0.5,    # Max 0.5 lot for gold
-            'XAUEUR': 0.5,
-            'US30': 0.3,      # Max 0.3 lot for indices
-            'US500': 0.3,
-            'NAS100': 0.3,
-            'BTCUSD': 0.1,    # Max 0.1 lot for crypto
-            'ETHUSD': 0.1,
-            'USOIL': 0.3,     # Max 0.3 lot for oil
-            'UKOIL': 0.3
-        }
-        
-        if symbol in max_lot_by_symbol:
-            lot_size = min(lot_size, max_lot_by_symbol[symbol])
+        max_lot = _MAX_LOT_BY_SYMBOL.get(symbol)
+        if max_lot is not None:
+            lot_size = min(lot_size, max_lot)
         
         # Apply broker limits
         lot_size = max(symbol_info.volume_min, min(lot_size, symbol_info.volume_max))
         
         # Round to step
-        volume_step = symbol_info.volume_step
-        lot_size = round(lot_size / volume_step) * volume_step
+        if symbol_info.inv_volume_step is not None:
+            volume_step = symbol_info.volume_step
+            lot_size = math.floor(lot_size * symbol_info.inv_volume_step + 0.5) * volume_step
         
         return round(lot_size, 2)
     
-    def check_daily_loss_limit(self) -> bool:
+    def check_daily_loss_limit(self, account_info=None) -> bool:
         """ตรวจสอบ daily loss limit"""
-        account_info = mt5.account_info()
+        if account_info is None:
+            account_info = mt5.account_info()
         current_balance = account_info.balance
         
         daily_loss_percent = (self.initial_balance - current_balance) / self.initial_balance
@@ -1354,11 +2137,12 @@ class RiskManager:
             return False
         return True
     
-    def check_weekly_loss_limit(self) -> bool:
+    def check_weekly_loss_limit(self, account_info=None) -> bool:
         """ตรวจสอบ weekly loss limit"""
         # This should track weekly P&L properly in production
         # For now, using a simplified check
-        account_info = mt5.account_info()
+        if account_info is None:
+            account_info = mt5.account_info()
         current_balance = account_info.balance
         
         weekly_loss_percent = (self.initial_balance - current_balance) / self.initial_balance
@@ -1368,25 +2152,22 @@ class RiskManager:
             return False
         return True
     
-    def check_correlation_limit(self, symbol: str) -> bool:
+    def check_correlation_limit(self, symbol: str, positions=None) -> bool:
         """ตรวจสอบ correlation limit"""
-        positions = mt5.positions_get()
+        if positions is None:
+            positions = mt5.positions_get()
         if not positions:
             return True
         
-        # Find which correlation group this symbol belongs to
-        symbol_groups = []
-        for group, symbols in self.correlation_groups.items():
-            if symbol in symbols:
-                symbol_groups.append(group)
-        
-        # Count positions in the same correlation group
-        correlated_positions = 0
-        for position in positions:
-            for group in symbol_groups:
-                if position.symbol in self.correlation_groups.get(group, []):
-                    correlated_positions += 1
-                    break
+        # Symbols correlated with this one (broker suffixes ignored)
+        correlated = self._correlated_symbols.get(_base_symbol(symbol))
+        if not correlated:
+            return True
+        
+        # Count positions on a correlated symbol - one set lookup per position
+        correlated_positions = sum(
+            1 for position in positions if _base_symbol(position.symbol) in correlated
+        )
         
         if correlated_positions >= self.max_correlation_trades:
             logger.warning(f"Correlation limit reached for {symbol}: {correlated_positions} positions")
@@ -1394,30 +2175,78 @@ class RiskManager:
         
         return True
     
-    def can_open_trade(self, symbol: str = None) -> Tuple[bool, str]:
-        """ตรวจสอบว่าสามารถเปิด trade ใหม่ได้หรือไม่"""
-        if not self.check_daily_loss_limit():
-            return False, "Daily loss limit reached"
-        
-        if not self.check_weekly_loss_limit():
-            return False, "Weekly loss limit reached"
+    # Loss-limit inputs are read-only: the loss gate closure is built from them once in __init__
+    @property
+    def initial_balance(self) -> float:
+        """Balance the loss limits are measured from"""
+        return self._initial_balance
+
+    @property
+    def max_daily_loss(self) -> float:
+        """Daily loss limit as a fraction of the initial balance"""
+        return self._max_daily_loss
+
+    @property
+    def max_weekly_loss(self) -> float:
+        """Weekly loss limit as a fraction of the initial balance"""
+        return self._max_weekly_loss
+
+    def _build_loss_gate(self):
+        """Daily and weekly loss checks as one closure over the read-only limits"""
+        initial_balance = self._initial_balance
+        max_loss = min(self._max_daily_loss, self._max_weekly_loss)
+
+        def within_loss_limits(balance: float) -> bool:
+            return (initial_balance - balance) / initial_balance < max_loss
+
+        return within_loss_limits
+
+    def can_open_trade(self, symbol: str = None, account_info=None,
+                       positions=None) -> Tuple[bool, str]:
+        """ตรวจสอบว่าสามารถเปิด trade ใหม่ได้หรือไม่ (pass snapshots to skip the terminal calls)"""
+        if account_info is None:
+            account_info = mt5.account_info()
+        if not self._within_loss_limits(account_info.balance):
+            # A limit was hit - the full checks name (and log) which one
+            if not self.check_daily_loss_limit(account_info):
+                return False, "Daily loss limit reached"
             
-        positions = mt5.positions_get()
+            if not self.check_weekly_loss_limit(account_info):
+                return False, "Weekly loss limit reached"
+            
+        if positions is None:
+            positions = mt5.positions_get()
         if positions and len(positions) >= self.max_open_trades:
             return False, f"Maximum open trades reached: {len(positions)}"
         
-        if symbol and not self.check_correlation_limit(symbol):
+        if symbol and not self.check_correlation_limit(symbol, positions):
             return False, f"Correlation limit reached for {symbol}"
             
         return True, "Can open trade"
 
 class MT5TradingExecutor:
     """Execute trades on MT5"""
+
+    # Position metadata flags (one int per ticket)
+    TP1_CLOSED = 1
+    TP2_CLOSED = 2
+    BE_SET = 4
     
-    def __init__(self, risk_manager: RiskManager, telegram_notifier: TelegramNotifier = None):
+    def __init__(self, risk_manager: RiskManager, telegram_notifier: TelegramNotifier = None,
+                 symbol_cache: SymbolInfoCache = None):
         self.risk_manager = risk_manager
         self.telegram = telegram_notifier
+        self.symbol_cache = symbol_cache or risk_manager.symbol_cache
         self.magic_number = 234000  # Unique identifier for our trades
+        # Predicate for positions opened by this bot (magic bound as a default - no attribute lookup per call)
+        self.is_our_position = lambda position, magic=self.magic_number: position.magic == magic
+        self._pending_orders = None  # (request, on_done) pairs while inside order_batch()
+        self._atr_cache = {}  # (symbol, H1 bar number) -> ATR for stop trailing
+        self._pip_values = {}  # symbol -> pip size used for position RR metrics
+        self._position_metadata = {}  # ticket -> TP1_CLOSED | TP2_CLOSED | BE_SET flags
+
+        # Trade journal (JSON lines) - opened on the first trade, then kept open for the life of the process
+        self._trade_log_file = None
         
     def execute_trade(self, signal: Dict, symbol: str) -> bool:
         """Execute trade based on signal"""
@@ -1461,7 +2290,7 @@ class MT5TradingExecutor:
             return False
         
         # Prepare order request
-        symbol_info = mt5.symbol_info(symbol)
+        symbol_info = self.symbol_cache.get(symbol)
         if not symbol_info:
             logger.error(f"Symbol {symbol} not found")
             return False
@@ -1470,33 +2299,31 @@ class MT5TradingExecutor:
             if not mt5.symbol_select(symbol, True):
                 logger.error(f"Failed to select {symbol}")
                 return False
+            self.symbol_cache.invalidate(symbol)
         
         # Determine order type
-        order_type = mt5.ORDER_TYPE_BUY if signal['decision'] == 'BUY' else mt5.ORDER_TYPE_SELL
+        order_type = _ORDER_TYPE_BUY if signal['decision'] == 'BUY' else _ORDER_TYPE_SELL
         
         # Get current price
         price = mt5.symbol_info_tick(symbol).ask if signal['decision'] == 'BUY' else mt5.symbol_info_tick(symbol).bid
         
         # Create order request
         request = {
-            "action": mt5.TRADE_ACTION_DEAL,
+            **_BASE_DEAL_REQUEST,
             "symbol": symbol,
             "volume": lot_size,
             "type": order_type,
             "price": price,
             "sl": signal['stop_loss'],
             "tp": signal['take_profit_1'],
-            "deviation": 20,
             "magic": self.magic_number,
             "comment": f"Gemini AI Trade - Conf: {signal['confidence']}%",
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
         }
         
         # Send order
         result = mt5.order_send(request)
         
-        if result.retcode != mt5.TRADE_RETCODE_DONE:
+        if result.retcode != _RETCODE_DONE:
             logger.error(f"Order failed: {result.retcode}, {result.comment}")
             if self.telegram:
                 self.telegram.send_trade_alert('ERROR', signal, symbol, lot_size,
@@ -1532,75 +2359,115 @@ class MT5TradingExecutor:
         }
         
         # Save to file
-        with open('trades.json', 'a') as f:
-            f.write(json.dumps(trade_log) + '\n')
+        if self._trade_log_file is None:
+            self._trade_log_file = open('trades.json', 'ab', buffering=0)
+            atexit.register(self._trade_log_file.close)
+        self._trade_log_file.write(_json_dumps_line(trade_log))
     
-    def manage_open_positions(self, gemini_ai: GeminiTradingAI, market_data_provider: MarketDataMT5):
+    def manage_open_positions(self, gemini_ai: GeminiTradingAI, market_data_provider: MarketDataMT5,
+                              positions=None):
         """Enhanced position management with partial close and advanced trailing"""
-        positions = mt5.positions_get()
+        if positions is None:
+            positions = mt5.positions_get()
 
-        if not positions:
+        # None is a terminal error - keep the metadata then
+        if positions is None:
             return
 
-        for position in positions:
-            if position.magic != self.magic_number:
-                continue
+        # Filter once; with none of ours open there is nothing to track or modify
+        ours = [position for position in positions if self.is_our_position(position)]
+        if not ours:
+            self._position_metadata.clear()
+            return
 
-            # Get current price and symbol info
-            symbol_info = mt5.symbol_info(position.symbol)
-            current_price = mt5.symbol_info_tick(position.symbol).bid if position.type == 0 else mt5.symbol_info_tick(position.symbol).ask
-
-            # Calculate profit metrics
-            pip_value = symbol_info.point * 10 if 'JPY' not in position.symbol else symbol_info.point * 100
-            pips_profit = (current_price - position.price_open) / pip_value * (1 if position.type == 0 else -1)
-            risk_amount = abs(position.price_open - position.sl) / pip_value if position.sl > 0 else 0
-            rr_ratio = pips_profit / risk_amount if risk_amount > 0 else 0
-
-            # Check position metadata for partial close tracking
-            position_metadata = self._get_position_metadata(position.ticket)
-
-            # PARTIAL CLOSE STRATEGY
-            # TP1: Close 50% at 1:1 RR
-            if rr_ratio >= 1.0 and not position_metadata.get('tp1_closed', False):
-                self._partial_close(position, 0.5, "TP1 - 1:1 RR")
-                self._update_position_metadata(position.ticket, 'tp1_closed', True)
-
-            # TP2: Close 30% more at 2:1 RR
-            elif rr_ratio >= 2.0 and not position_metadata.get('tp2_closed', False):
-                remaining = position.volume * 0.3
-                self._partial_close(position, remaining, "TP2 - 2:1 RR")
-                self._update_position_metadata(position.ticket, 'tp2_closed', True)
-
-            # TP3: Let 20% run with trailing stop
-            elif rr_ratio >= 3.0:
-                self._advanced_trail_stop(position, current_price, rr_ratio)
-
-            # BREAK-EVEN MANAGEMENT
-            elif rr_ratio >= 0.5 and not position_metadata.get('be_set', False):
-                # Move stop loss to break-even when 50% to TP1
-                self._set_break_even(position)
-                self._update_position_metadata(position.ticket, 'be_set', True)
-
-            # DYNAMIC TRAILING STOP based on ATR
-            if pips_profit > 0:
-                self._dynamic_trail_stop(position, current_price, market_data_provider)
+        # One tick per symbol for this cycle, shared by every position on that symbol
+        ticks = {}
+        live_tickets = set()
+
+        # Orders are queued while iterating and sent concurrently when the batch closes
+        with self.order_batch():
+            for position in ours:
+                live_tickets.add(position.ticket)
+
+                # Get current price and symbol info
+                symbol_info = self.symbol_cache.get(position.symbol)
+                tick = ticks.get(position.symbol)
+                if tick is None:
+                    tick = ticks[position.symbol] = mt5.symbol_info_tick(position.symbol)
+                current_price = (tick.bid, tick.ask)[position.type]  # BUY closes at bid, SELL at ask
+
+                # Calculate profit metrics
+                pip_value = self._pip_values.get(position.symbol)
+                if pip_value is None:
+                    pip_value = symbol_info.point * 10 if 'JPY' not in position.symbol else symbol_info.point * 100
+                    self._pip_values[position.symbol] = pip_value
+                pips_profit = (current_price - position.price_open) / pip_value * (1 - 2 * position.type)
+                risk_amount = abs(position.price_open - position.sl) / pip_value if position.sl > 0 else 0
+                rr_ratio = pips_profit / risk_amount if risk_amount > 0 else 0
+
+                # Check position metadata (bit flags) for partial close tracking
+                flags = self._get_position_metadata(position.ticket)
+
+                # PARTIAL CLOSE / BREAK-EVEN STRATEGY - first matching rule wins
+                for threshold, flag, action in self._EXIT_RULES:
+                    if rr_ratio >= threshold and not flags & flag:
+                        action(self, position, tick, current_price, rr_ratio, symbol_info)
+                        if flag:
+                            self._position_metadata[position.ticket] = flags | flag
+                        break
+
+                # DYNAMIC TRAILING STOP based on ATR
+                if pips_profit > 0:
+                    self._dynamic_trail_stop(position, current_price, market_data_provider)
+
+        # Forget closed tickets so metadata stays bounded by the open positions
+        if not live_tickets.issuperset(self._position_metadata):
+            self._position_metadata = {ticket: flags for ticket, flags in self._position_metadata.items()
+                                       if ticket in live_tickets}
+
+    # Exit rule actions - shared signature so manage_open_positions can dispatch from a table
+    def _exit_tp1(self, position, tick, current_price: float, rr_ratio: float, symbol_info):
+        """TP1: Close 50% at 1:1 RR"""
+        self._partial_close(position, 0.5, "TP1 - 1:1 RR", tick=tick)
+
+    def _exit_tp2(self, position, tick, current_price: float, rr_ratio: float, symbol_info):
+        """TP2: Close 30% more at 2:1 RR"""
+        remaining = position.volume * 0.3
+        self._partial_close(position, remaining, "TP2 - 2:1 RR", tick=tick)
+
+    def _exit_tp3_trail(self, position, tick, current_price: float, rr_ratio: float, symbol_info):
+        """TP3: Let 20% run with trailing stop"""
+        self._advanced_trail_stop(position, current_price, rr_ratio, symbol_info=symbol_info)
+
+    def _exit_break_even(self, position, tick, current_price: float, rr_ratio: float, symbol_info):
+        """Move stop loss to break-even when 50% to TP1"""
+        self._set_break_even(position, symbol_info=symbol_info)
+
+    # Exit rule table - defined after the _exit_* actions it references
+    # (min RR, metadata flag set once done or 0 for repeatable, action) - checked in this order
+    _EXIT_RULES = (
+        (1.0, TP1_CLOSED, _exit_tp1),
+        (2.0, TP2_CLOSED, _exit_tp2),
+        (3.0, 0, _exit_tp3_trail),
+        (0.5, BE_SET, _exit_break_even),
+    )
     
     def _trail_stop_loss(self, position, current_price: float):
         """Trail stop loss for profitable positions"""
-        symbol_info = mt5.symbol_info(position.symbol)
+        symbol_info = self.symbol_cache.get(position.symbol)
         
         # Calculate new stop loss (trail by 50% of profit)
         if position.type == 0:  # BUY
             new_sl = position.price_open + (current_price - position.price_open) * 0.5
             if new_sl > position.sl:
-                self._modify_position(position.ticket, new_sl, position.tp)
+                self._modify_position(position.ticket, new_sl, position.tp, position.symbol)
         else:  # SELL
             new_sl = position.price_open - (position.price_open - current_price) * 0.5
             if new_sl < position.sl:
-                self._modify_position(position.ticket, new_sl, position.tp)
+                self._modify_position(position.ticket, new_sl, position.tp, position.symbol)
     
-    def _modify_position(self, ticket: int, sl: float, tp: float):
-        """Modify position SL/TP"""
+    def _modify_position(self, ticket: int, sl: float, tp: float, symbol: str = "Unknown"):
+        """Modify position SL/TP (symbol is only used for the alert)"""
         request = {
             "action": mt5.TRADE_ACTION_SLTP,
             "position": ticket,
@@ -1608,63 +2475,67 @@ class MT5TradingExecutor:
             "tp": tp,
         }
         
-        result = mt5.order_send(request)
-        if result.retcode == mt5.TRADE_RETCODE_DONE:
-            logger.info(f"Position {ticket} modified: SL={sl}")
-            if self.telegram:
-                # Get position info for symbol
-                position = mt5.positions_get(ticket=ticket)
-                symbol = position[0].symbol if position else "Unknown"
-                self.telegram.send_trade_alert('MODIFIED', {}, symbol, 
-                                              result={'ticket': ticket, 'sl': sl, 'tp': tp})
+        def on_done(result):
+            if result.retcode == _RETCODE_DONE:
+                logger.info(f"Position {ticket} modified: SL={sl}")
+                if self.telegram:
+                    self.telegram.send_trade_alert('MODIFIED', {}, symbol, 
+                                                  result={'ticket': ticket, 'sl': sl, 'tp': tp})
+
+        self._submit_order(request, on_done)
     
-    def _partial_close(self, position, volume_to_close, reason: str) -> bool:
-        """Partially close a position"""
+    def _partial_close(self, position, volume_to_close, reason: str, tick=None) -> bool:
+        """Partially close a position (tick may be passed in from the manage cycle)"""
         if volume_to_close > position.volume:
             volume_to_close = position.volume
 
-        close_type = mt5.ORDER_TYPE_SELL if position.type == 0 else mt5.ORDER_TYPE_BUY
-        price = mt5.symbol_info_tick(position.symbol).bid if position.type == 0 else mt5.symbol_info_tick(position.symbol).ask
+        close_type = _CLOSE_ORDER_TYPE[position.type]
+        if tick is None:
+            tick = mt5.symbol_info_tick(position.symbol)
+        price = tick.bid if position.type == 0 else tick.ask
 
         request = {
-            "action": mt5.TRADE_ACTION_DEAL,
+            **_BASE_DEAL_REQUEST,
             "symbol": position.symbol,
             "volume": round(volume_to_close, 2),
             "type": close_type,
             "position": position.ticket,
             "price": price,
-            "deviation": 20,
             "magic": self.magic_number,
             "comment": f"Partial close: {reason}",
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
         }
 
-        result = mt5.order_send(request)
-        if result.retcode == mt5.TRADE_RETCODE_DONE:
-            logger.info(f"Partially closed {volume_to_close} lots of position {position.ticket}: {reason}")
-            if self.telegram:
-                message = f"⚡ PARTIAL CLOSE: {position.symbol}\n"
-                message += f"Volume: {volume_to_close} lots\n"
-                message += f"Reason: {reason}\n"
-                message += f"Profit: ${position.profit * (volume_to_close/position.volume):.2f}"
-                self.telegram.send_message(message)
-            return True
-        return False
+        def on_done(result):
+            if result.retcode == _RETCODE_DONE:
+                logger.info(f"Partially closed {volume_to_close} lots of position {position.ticket}: {reason}")
+                if self.telegram:
+                    message = f"⚡ PARTIAL CLOSE: {position.symbol}\n"
+                    message += f"Volume: {volume_to_close} lots\n"
+                    message += f"Reason: {reason}\n"
+                    message += f"Profit: ${position.profit * (volume_to_close/position.volume):.2f}"
+                    self.telegram.send_message(message)
+                return True
+            return False
 
-    def _set_break_even(self, position) -> bool:
+        return self._submit_order(request, on_done)
+
+    def _set_break_even(self, position, symbol_info=None) -> bool:
         """Move stop loss to break-even"""
+        if symbol_info is None:
+            symbol_info = self.symbol_cache.get(position.symbol)
         # Add small buffer for spread/commission
-        buffer = mt5.symbol_info(position.symbol).point * 2
+        buffer = symbol_info.point * 2
         new_sl = position.price_open + buffer if position.type == 0 else position.price_open - buffer
 
         if (position.type == 0 and new_sl > position.sl) or (position.type == 1 and new_sl < position.sl):
-            return self._modify_position(position.ticket, new_sl, position.tp)
+            return self._modify_position(position.ticket, new_sl, position.tp, position.symbol)
         return False
 
-    def _advanced_trail_stop(self, position, current_price: float, rr_ratio: float):
+    def _advanced_trail_stop(self, position, current_price: float, rr_ratio: float,
+                             symbol_info=None):
         """Advanced trailing stop based on RR ratio"""
-        symbol_info = mt5.symbol_info(position.symbol)
+        if symbol_info is None:
+            symbol_info = self.symbol_cache.get(position.symbol)
         atr_trail = symbol_info.point * 20  # Default ATR-based trail
 
         # Dynamic trailing based on RR achieved
@@ -1678,88 +2549,214 @@ class MT5TradingExecutor:
         if position.type == 0:  # BUY
             new_sl = current_price - abs(trail_distance)
             if new_sl > position.sl:
-                self._modify_position(position.ticket, new_sl, position.tp)
+                self._modify_position(position.ticket, new_sl, position.tp, position.symbol)
         else:  # SELL
             new_sl = current_price + abs(trail_distance)
             if new_sl < position.sl:
-                self._modify_position(position.ticket, new_sl, position.tp)
+                self._modify_position(position.ticket, new_sl, position.tp, position.symbol)
 
     def _dynamic_trail_stop(self, position, current_price: float, market_data_provider: MarketDataMT5):
         """Dynamic trailing stop based on ATR"""
         try:
             # Get recent ATR for dynamic trailing
-            df = market_data_provider.get_rates(position.symbol, mt5.TIMEFRAME_H1, 50)
-            if not df.empty:
-                df = market_data_provider.calculate_indicators(df)
-                current_atr = df['atr'].iloc[-1]
-
+            current_atr = self._get_h1_atr(position.symbol, market_data_provider)
+            if current_atr is not None:
                 # Trail at 2x ATR distance
                 trail_distance = current_atr * 2
 
                 if position.type == 0:  # BUY
                     new_sl = current_price - trail_distance
                     if new_sl > position.sl and new_sl > position.price_open:
-                        self._modify_position(position.ticket, new_sl, position.tp)
+                        self._modify_position(position.ticket, new_sl, position.tp, position.symbol)
                 else:  # SELL
                     new_sl = current_price + trail_distance
                     if new_sl < position.sl and new_sl < position.price_open:
-                        self._modify_position(position.ticket, new_sl, position.tp)
+                        self._modify_position(position.ticket, new_sl, position.tp, position.symbol)
         except Exception as e:
             logger.error(f"Error in dynamic trail stop: {e}")
 
-    # Position metadata management
-    _position_metadata = {}
+    def _get_h1_atr(self, symbol: str, market_data_provider: MarketDataMT5) -> Optional[float]:
+        """H1 ATR, computed once per symbol per hourly bar"""
+        bar = int(time.time()) // 3600
+        atr = self._atr_cache.get((symbol, bar))
+        if atr is None:
+            atr = market_data_provider.get_last_atr(symbol, bar)
+        if atr is None:
+            # Same bar count as the analysis, so both sources give the same Wilder-smoothed value
+            df = market_data_provider.get_rates(symbol, mt5.TIMEFRAME_H1, market_data_provider.ANALYSIS_BARS)
+            if df.empty:
+                return None
+            atr = float(market_data_provider.calculate_atr(df)[-1])
 
-    def _get_position_metadata(self, ticket: int) -> Dict:
-        """Get metadata for a position"""
-        return self._position_metadata.get(ticket, {})
+            # Keep only the current and previous bar
+            for key in [key for key in self._atr_cache if key[1] < bar - 1]:
+                del self._atr_cache[key]
+            self._atr_cache[(symbol, bar)] = atr
+        return atr
 
-    def _update_position_metadata(self, ticket: int, key: str, value):
-        """Update metadata for a position"""
-        if ticket not in self._position_metadata:
-            self._position_metadata[ticket] = {}
-        self._position_metadata[ticket][key] = value
+    # Position metadata management
+    def _get_position_metadata(self, ticket: int) -> int:
+        """Get metadata flags for a position"""
+        return self._position_metadata.get(ticket, 0)
 
-    def close_position(self, position) -> bool:
+    def close_position(self, position, tick=None, comment: str = "Position closed by bot") -> bool:
         """Close a specific position"""
         # Close position
-        close_type = mt5.ORDER_TYPE_SELL if position.type == 0 else mt5.ORDER_TYPE_BUY
-        price = mt5.symbol_info_tick(position.symbol).bid if position.type == 0 else mt5.symbol_info_tick(position.symbol).ask
+        close_type = _CLOSE_ORDER_TYPE[position.type]
+        if tick is None:
+            tick = mt5.symbol_info_tick(position.symbol)
+        price = tick.bid if position.type == 0 else tick.ask
         
         request = {
-            "action": mt5.TRADE_ACTION_DEAL,
+            **_BASE_DEAL_REQUEST,
             "symbol": position.symbol,
             "volume": position.volume,
             "type": close_type,
             "position": position.ticket,
             "price": price,
-            "deviation": 20,
             "magic": self.magic_number,
-            "comment": "Position closed by bot",
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
+            "comment": comment,
         }
         
-        result = mt5.order_send(request)
-        if result.retcode == mt5.TRADE_RETCODE_DONE:
-            logger.info(f"Closed position {position.ticket}")
-            if self.telegram:
-                self.telegram.send_trade_alert('CLOSED', {}, position.symbol,
-                                              result={'order': position.ticket, 
-                                                     'price': price,
-                                                     'profit': position.profit})
-            return True
-        return False
+        def on_done(result):
+            if result.retcode == _RETCODE_DONE:
+                logger.info(f"Closed position {position.ticket}")
+                if self.telegram:
+                    self.telegram.send_trade_alert('CLOSED', {}, position.symbol,
+                                                  result={'order': position.ticket, 
+                                                         'price': price,
+                                                         'profit': position.profit})
+                return True
+            return False
+
+        return self._submit_order(request, on_done)
+
+    @contextmanager
+    def order_batch(self):
+        """Queue orders submitted inside the block and send them concurrently on exit"""
+        self._pending_orders = []
+        try:
+            yield
+        finally:
+            pending, self._pending_orders = self._pending_orders, None
+            self._dispatch_orders(pending)
+
+    def _submit_order(self, request: Dict, on_done):
+        """Send an order now, or queue it inside order_batch; on_done(result) handles the outcome"""
+        if self._pending_orders is not None:
+            self._pending_orders.append((request, on_done))
+            return None  # Outcome is only known once the batch is sent
+        return on_done(mt5.order_send(request))
+
+    def _dispatch_orders(self, pending: List[Tuple[Dict, object]]):
+        """Send queued orders in parallel - one worker per position, so its orders keep their order"""
+        if not pending:
+            return
+
+        by_position = OrderedDict()
+        for request, on_done in pending:
+            by_position.setdefault(request.get('position'), []).append((request, on_done))
+
+        def send_all(orders):
+            return [mt5.order_send(request) for request, _ in orders]
+
+        futures = [(orders, _ORDER_POOL.submit(send_all, orders)) for orders in by_position.values()]
+
+        # Callbacks (logging, Telegram) run here on the calling thread, in submission order
+        for orders, future in futures:
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"Error sending orders for position {orders[0][0].get('position')}: {e}")
+                continue
+            for (request, on_done), result in zip(orders, results):
+                try:
+                    on_done(result)
+                except Exception as e:
+                    logger.error(f"Error handling order result for position {request.get('position')}: {e}")
+
+# Per-symbol settings, frozen once the config is merged
+SymbolConfig = namedtuple('SymbolConfig', 'enabled max_spread')
+
+# Default TradingBot configuration - deep-copied per instance, never mutated
+_DEFAULT_CONFIG = {
+    'symbols': {
+        # Major Forex Pairs
+        'EURUSDc': {'enabled': True, 'max_spread': 20},  # Broker symbol
+        # 'GBPUSD': {'enabled': True, 'max_spread': 30},
+        # 'USDJPY': {'enabled': True, 'max_spread': 20},
+        # 'USDCHF': {'enabled': True, 'max_spread': 25},
+        # 'USDCAD': {'enabled': True, 'max_spread': 25},
+        # 'AUDUSD': {'enabled': True, 'max_spread': 25},
+        # 'NZDUSD': {'enabled': True, 'max_spread': 30},
+        
+        # # Cross Pairs
+        # 'EURGBP': {'enabled': True, 'max_spread': 30},
+        # 'EURJPY': {'enabled': True, 'max_spread': 30},
+        # 'GBPJPY': {'enabled': True, 'max_spread': 40},
+        # 'AUDJPY': {'enabled': True, 'max_spread': 35},
+        # 'EURCHF': {'enabled': False, 'max_spread': 30},
+        
+        # # Commodities
+        'XAUUSDc': {'enabled': True, 'max_spread': 50},  # Gold - Broker symbol
+        # 'XAUEUR': {'enabled': False, 'max_spread': 60},  # Gold in EUR
+        # 'XAGUSD': {'enabled': True, 'max_spread': 50},  # Silver
+        # 'USOIL': {'enabled': True, 'max_spread': 50},   # WTI Oil
+        # 'UKOIL': {'enabled': False, 'max_spread': 50},   # Brent Oil
+        
+        # # Indices (if your broker supports)
+        # 'US30': {'enabled': False, 'max_spread': 50},    # Dow Jones
+        # 'US500': {'enabled': False, 'max_spread': 30},   # S&P 500
+        # 'NAS100': {'enabled': False, 'max_spread': 40},  # Nasdaq
+        # 'DE30': {'enabled': False, 'max_spread': 40},    # DAX
+        # 'UK100': {'enabled': False, 'max_spread': 40},   # FTSE
+        # 'JP225': {'enabled': False, 'max_spread': 50},   # Nikkei
+        
+        # # Crypto (if your broker supports)
+        # 'BTCUSD': {'enabled': False, 'max_spread': 100},
+        # 'ETHUSD': {'enabled': False, 'max_spread': 80}
+    },
+    'check_interval': 300,  # 5 minutes
+    'use_news_filter': True,  # Avoid trading during high-impact news
+    'max_spread_multiplier': 2.0,  # Don't trade if spread > normal * multiplier
+    'trading_sessions': {
+        'ASIAN': {'start': 0, 'end': 9, 'volatility_factor': 0.7},
+        'EUROPEAN': {'start': 7, 'end': 16, 'volatility_factor': 1.0},
+        'US': {'start': 13, 'end': 22, 'volatility_factor': 1.2},
+        'enabled': True  # Enable session-based filtering
+    },
+    'risk_config': {}  # Will be passed to RiskManager
+}
+
 
 class TradingBot:
     """Main Trading Bot Controller"""
 
+    # Best sessions for each symbol type
+    _SYMBOL_SESSIONS = MappingProxyType({
+        'EURUSD': frozenset(('EUROPEAN', 'US')),
+        'GBPUSD': frozenset(('EUROPEAN', 'US')),
+        'USDJPY': frozenset(('ASIAN', 'US')),
+        'AUDUSD': frozenset(('ASIAN', 'US')),
+        'NZDUSD': frozenset(('ASIAN', 'US')),
+        'XAUUSD': frozenset(('EUROPEAN', 'US')),  # Gold most active in London/NY
+        'USOIL': frozenset(('US',)),
+        'US30': frozenset(('US',)),
+        'US500': frozenset(('US',)),
+        'NAS100': frozenset(('US',)),
+        'DE30': frozenset(('EUROPEAN',)),
+        'UK100': frozenset(('EUROPEAN',)),
+        'JP225': frozenset(('ASIAN',)),
+    })
+    _DEFAULT_SESSIONS = frozenset(('EUROPEAN', 'US'))
+
     def __init__(self, mt5_login: Optional[int] = None, mt5_password: Optional[str] = None,
                  mt5_server: Optional[str] = None, gemini_api_key: str = None,
                  telegram_token: str = None, telegram_chat_id: str = None, config: Dict = None):
         # Initialize components - Support no-login mode
         self.mt5_conn = MT5Connection(mt5_login, mt5_password, mt5_server)
-        self.market_data = MarketDataMT5()
+        self.symbol_cache = SymbolInfoCache()  # Shared by market data, risk manager and executor
+        self.market_data = MarketDataMT5(self.symbol_cache)
         
         # Initialize Telegram notifier first
         self.telegram = TelegramNotifier(telegram_token, telegram_chat_id) if telegram_token else None
@@ -1772,56 +2769,10 @@ class TradingBot:
         
         self.risk_manager = None  # Will be initialized after connection
         self.executor = None  # Will be initialized after connection
+        self._symbol_pool = None  # Per-symbol analysis workers, created in start()
         
-        # Default configuration
-        default_config = {
-            'symbols': {
-                # Major Forex Pairs
-                'EURUSDc': {'enabled': True, 'max_spread': 20},  # Broker symbol
-                # 'GBPUSD': {'enabled': True, 'max_spread': 30},
-                # 'USDJPY': {'enabled': True, 'max_spread': 20},
-                # 'USDCHF': {'enabled': True, 'max_spread': 25},
-                # 'USDCAD': {'enabled': True, 'max_spread': 25},
-                # 'AUDUSD': {'enabled': True, 'max_spread': 25},
-                # 'NZDUSD': {'enabled': True, 'max_spread': 30},
-                
-                # # Cross Pairs
-                # 'EURGBP': {'enabled': True, 'max_spread': 30},
-                # 'EURJPY': {'enabled': True, 'max_spread': 30},
-                # 'GBPJPY': {'enabled': True, 'max_spread': 40},
-                # 'AUDJPY': {'enabled': True, 'max_spread': 35},
-                # 'EURCHF': {'enabled': False, 'max_spread': 30},
-                
-                # # Commodities
-                'XAUUSDc': {'enabled': True, 'max_spread': 50},  # Gold - Broker symbol
-                # 'XAUEUR': {'enabled': False, 'max_spread': 60},  # Gold in EUR
-                # 'XAGUSD': {'enabled': True, 'max_spread': 50},  # Silver
-                # 'USOIL': {'enabled': True, 'max_spread': 50},   # WTI Oil
-                # 'UKOIL': {'enabled': False, 'max_spread': 50},   # Brent Oil
-                
-                # # Indices (if your broker supports)
-                # 'US30': {'enabled': False, 'max_spread': 50},    # Dow Jones
-                # 'US500': {'enabled': False, 'max_spread': 30},   # S&P 500
-                # 'NAS100': {'enabled': False, 'max_spread': 40},  # Nasdaq
-                # 'DE30': {'enabled': False, 'max_spread': 40},    # DAX
-                # 'UK100': {'enabled': False, 'max_spread': 40},   # FTSE
-                # 'JP225': {'enabled': False, 'max_spread': 50},   # Nikkei
-                
-                # # Crypto (if your broker supports)
-                # 'BTCUSD': {'enabled': False, 'max_spread': 100},
-                # 'ETHUSD': {'enabled': False, 'max_spread': 80}
-            },
-            'check_interval': 300,  # 5 minutes
-            'use_news_filter': True,  # Avoid trading during high-impact news
-            'max_spread_multiplier': 2.0,  # Don't trade if spread > normal * multiplier
-            'trading_sessions': {
-                'ASIAN': {'start': 0, 'end': 9, 'volatility_factor': 0.7},
-                'EUROPEAN': {'start': 7, 'end': 16, 'volatility_factor': 1.0},
-                'US': {'start': 13, 'end': 22, 'volatility_factor': 1.2},
-                'enabled': True  # Enable session-based filtering
-            },
-            'risk_config': {}  # Will be passed to RiskManager
-        }
+        # Default configuration (private copy - the merge below mutates it)
+        default_config = copy.deepcopy(_DEFAULT_CONFIG)
         
         # Merge with custom config
         if config:
@@ -1834,12 +2785,47 @@ class TradingBot:
                     default_config[key] = value
         
         self.config = default_config
+
+        # Frozen views of the settings read on every loop iteration - attribute loads, not nested dict probes
+        self._symbol_config = MappingProxyType({
+            symbol: SymbolConfig(settings.get('enabled', False), settings.get('max_spread', 50))
+            for symbol, settings in self.config['symbols'].items()
+        })
+        self._use_news_filter = self.config.get('use_news_filter', True)
+        self._sessions_enabled = self.config['trading_sessions'].get('enabled', True)
+        self._max_spread_multiplier = self.config.get('max_spread_multiplier', 2.0)
+        self._check_interval = self.config.get('check_interval', 300)  # Default 5 minutes
+
+        # Session for each hour of the day (trading filter only - the prompt uses _SESSION_BY_HOUR)
+        self._hour_to_session = _sessions_by_hour(self.config['trading_sessions'])
+
+        # 24-bit hour masks: bit h set when the session at hour h is one the symbol prefers
+        def hours_mask(preferred):
+            return sum(1 << hour for hour, session in enumerate(self._hour_to_session) if session in preferred)
+
+        self._session_hour_masks = {symbol: hours_mask(preferred)
+                                    for symbol, preferred in self._SYMBOL_SESSIONS.items()}
+        self._default_session_hour_mask = hours_mask(self._DEFAULT_SESSIONS)
         
         # Get enabled symbols
-        self.symbols = [symbol for symbol, settings in self.config['symbols'].items() 
-                       if settings.get('enabled', False)]
+        self.symbols = [symbol for symbol, settings in self._symbol_config.items() if settings.enabled]
+
+        # Spread limits aligned with self.symbols so all symbols are checked in one compare
+        self._max_spread_allowed = np.array(
+            [self._symbol_config[symbol].max_spread for symbol in self.symbols], dtype=np.float64
+        ) * self._max_spread_multiplier
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
         
         self.running = False
+
+        # Scheduling / alert state checked every loop iteration
+        self._news_alert_interval = 1800  # seconds between upcoming-news alerts
+        self._next_news_alert = 0.0  # time.monotonic() deadline; 0 sends on the first check
+        self._last_summary_hour = -1
+        self._daily_loss_alerted = False
+        self._peak_balance = 0.0
+        self._last_drawdown_alert = 0.0
+        self._last_bar_time = {}  # symbol -> open time of the last M5 bar Gemini decided on
         
         logger.info(f"Trading Bot configured with {len(self.symbols)} symbols: {', '.join(self.symbols)}")
         
@@ -1857,8 +2843,13 @@ class TradingBot:
         
         # Initialize risk manager with account balance and config
         account_info = mt5.account_info()
-        self.risk_manager = RiskManager(account_info.balance, self.config.get('risk_config', {}))
-        self.executor = MT5TradingExecutor(self.risk_manager, self.telegram)
+        self.risk_manager = RiskManager(account_info.balance, self.config.get('risk_config', {}),
+                                        symbol_cache=self.symbol_cache)
+        self.executor = MT5TradingExecutor(self.risk_manager, self.telegram, symbol_cache=self.symbol_cache)
+
+        # Worker threads live for the whole session instead of being rebuilt every check
+        self._symbol_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(5, len(self.symbols)), thread_name_prefix='symbol')
         
         self.running = True
         logger.info("Trading Bot started successfully")
@@ -1874,77 +2865,126 @@ class TradingBot:
     
     def run(self):
         """Main trading loop with async support"""
-        check_interval = self.config.get('check_interval', 300)  # Default 5 minutes
+        check_interval = self._check_interval
 
         while self.running:
             try:
-                logger.info(f"Checking markets at {datetime.now()}")
-
-                # Process symbols in parallel using threading for better performance
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                    # Submit all symbol analysis tasks
-                    futures = []
-                    for symbol in self.symbols:
-                        future = executor.submit(self._process_symbol, symbol)
-                        futures.append((symbol, future))
-
-                    # Collect results
-                    for symbol, future in futures:
-                        try:
-                            result = future.result(timeout=30)
-                            if result and result.get('signal'):
-                                # Execute trade if signal generated
-                                self.executor.execute_trade(result['signal'], symbol)
-                        except Exception as e:
-                            logger.error(f"Error processing {symbol}: {e}")
+                # One wall-clock reading per iteration for logging, filters and scheduling
+                now = datetime.now()
+                logger.info(f"Checking markets at {now}")
+
+                # Cheap risk gates first - symbols that could not be traded are never analyzed or sent to Gemini
+                risk_positions = mt5.positions_get()
+                risk_account = mt5.account_info()
+                if risk_account is None:
+                    # No account snapshot - skip new trades but still manage the open positions below
+                    logger.warning(f"Account info unavailable: {mt5.last_error()}")
+                    can_trade, reason = False, "Account info unavailable"
+                else:
+                    can_trade, reason = self.risk_manager.can_open_trade(account_info=risk_account,
+                                                                         positions=risk_positions)
+                symbols = []
+                if can_trade:
+                    symbols = [symbol for symbol in self.symbols
+                               if self.risk_manager.check_correlation_limit(symbol, risk_positions)]
+                else:
+                    logger.info(f"Skipping market analysis: {reason}")
+
+                # News avoidance flags for every symbol in one pass - used by the filter and the prompts
+                news_flags = self.news_checker.should_avoid_trading_batch(symbols) if symbols else {}
+
+                # One terminal call refreshes the symbol snapshots used by every filter below
+                self.symbol_cache.refresh(symbols)
+
+                # Spread filter for every symbol in one pass
+                spread_flags = self._check_spreads(symbols) if symbols else {}
+
+                # Process symbols in parallel on the session's worker pool
+                futures = []
+                for symbol in symbols:
+                    future = self._symbol_pool.submit(self._process_symbol, symbol, news_flags.get(symbol), now,
+                                                      spread_flags.get(symbol))
+                    futures.append((symbol, future))
+
+                # Collect market data for symbols that passed the filters
+                analyzed = []
+                for symbol, future in futures:
+                    try:
+                        result = future.result(timeout=30)
+                        if result and result.get('market_data'):
+                            analyzed.append((symbol, result['market_data']))
+                    except Exception as e:
+                        logger.error(f"Error processing {symbol}: {e}")
+
+                # Get AI decisions for all symbols concurrently
+                signals = self.gemini_ai.analyze_batch([market_data for _, market_data in analyzed])
+                for (symbol, market_data), signal in zip(analyzed, signals):
+                    # Mark the bar only once a decision came back, so failed requests are retried within it
+                    if 'error' not in signal:
+                        self._last_bar_time[symbol] = market_data.get('bar_time')
+                    try:
+                        if signal['decision'] != 'HOLD':
+                            logger.info(f"Signal for {symbol}: {signal['decision']} with {signal['confidence']}% confidence")
+                            # Execute trade if signal generated
+                            self.executor.execute_trade(signal, symbol)
+                        else:
+                            logger.info(f"No trade signal for {symbol}")
+                    except Exception as e:
+                        logger.error(f"Error processing {symbol}: {e}")
+
+                # One account/positions snapshot per iteration for management, status, summary and alerts
+                account_info = mt5.account_info()
+                positions = mt5.positions_get()
 
                 # Manage existing positions
-                self.executor.manage_open_positions(self.gemini_ai, self.market_data)
+                self.executor.manage_open_positions(self.gemini_ai, self.market_data, positions)
 
                 # Show account status
-                self._show_account_status()
+                self._show_account_status(positions, account_info)
 
                 # Send daily summary to Telegram at specific times
-                current_hour = datetime.now().hour
-                current_minute = datetime.now().minute
+                current_hour = now.hour
 
-                # Check for news alerts every 30 minutes
-                if current_minute % 30 == 0:
-                    if not hasattr(self, '_last_news_check_minute') or self._last_news_check_minute != current_minute:
-                        self.news_checker.send_news_alert(hours_ahead=1)
-                        self._last_news_check_minute = current_minute
+                # Check for news alerts every 30 minutes (monotonic - immune to clock changes)
+                if time.monotonic() >= self._next_news_alert:
+                    self.news_checker.send_news_alert(hours_ahead=1)
+                    self._next_news_alert = time.monotonic() + self._news_alert_interval
 
                 # Send account summary at specific times
-                if self.telegram and current_hour in [9, 15, 21]:  # 9am, 3pm, 9pm
-                    if not hasattr(self, '_last_summary_hour') or self._last_summary_hour != current_hour:
-                        account_info = mt5.account_info()
-                        positions = mt5.positions_get()
+                if self.telegram and account_info is not None and current_hour in [9, 15, 21]:  # 9am, 3pm, 9pm
+                    if self._last_summary_hour != current_hour:
                         self.telegram.send_account_summary(account_info, positions)
                         self._last_summary_hour = current_hour
 
                 # Check for risk alerts
-                self._check_risk_alerts()
+                self._check_risk_alerts(account_info)
 
-                # Wait for next check
-                logger.info(f"Waiting {check_interval} seconds for next check...")
-                time.sleep(check_interval)
+                # Wait for next check - wake just after the next bar close instead of a fixed delay
+                sleep_for = check_interval - int(time.time()) % check_interval + 1
+                logger.info(f"Waiting {sleep_for} seconds for next check...")
+                time.sleep(sleep_for)
 
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
                 time.sleep(60)  # Wait before retry
 
-    def _process_symbol(self, symbol: str) -> Dict:
-        """Process individual symbol analysis"""
+    def _process_symbol(self, symbol: str, news_flag: Optional[Tuple[bool, str]] = None,
+                        now: datetime = None, spread_ok: Optional[bool] = None) -> Dict:
+        """Filter a symbol and load its market analysis (AI decisions are batched in run)"""
         try:
+            if now is None:
+                now = datetime.now()
+
             # Check if market is open
-            if not self._is_market_open(symbol):
+            if not self._is_market_open(symbol, now):
                 logger.info(f"Market closed for {symbol}")
                 return {}
 
             # Check for upcoming news
-            if self.config.get('use_news_filter', True):
-                avoid_news, news_reason = self.news_checker.should_avoid_trading(symbol)
+            if self._use_news_filter:
+                if news_flag is None:
+                    news_flag = self.news_checker.should_avoid_trading(symbol)
+                avoid_news, news_reason = news_flag
                 if avoid_news:
                     logger.info(f"Avoiding {symbol} due to news: {news_reason}")
                     if self.telegram:
@@ -1954,50 +2994,63 @@ class TradingBot:
                     return {}
 
             # Check spread
-            if not self._check_spread(symbol):
+            if not (spread_ok if spread_ok is not None else self._check_spread(symbol)):
                 logger.info(f"Spread too high for {symbol}")
                 return {}
 
             # Check trading session if enabled
-            if self.config['trading_sessions'].get('enabled', True):
-                if not self._is_good_trading_session(symbol):
+            if self._sessions_enabled:
+                if not self._is_good_trading_session(symbol, now):
                     logger.info(f"Not optimal trading session for {symbol}")
                     return {}
 
-            # Get market analysis
+            # Nothing new to analyze until another M5 bar opens - checked before any indicators are built
+            bar_time = self.market_data.latest_bar_time(symbol)
+            if bar_time is not None and bar_time == self._last_bar_time.get(symbol):
+                logger.info(f"No new bar for {symbol}")
+                return {}
+
+            # Get market analysis (its M5 frame comes from the rates cache just filled)
             market_data = self.market_data.get_market_analysis(symbol)
 
             if not market_data:
                 logger.warning(f"No market data for {symbol}")
                 return {}
 
-            # Get AI decision
+            # Return market data for the AI decision (with the news flag, so the prompt needs no news scan)
+            market_data['news_flag'] = news_flag
             logger.info(f"Analyzing {symbol}...")
-            signal = self.gemini_ai.analyze_and_decide(market_data)
-
-            # Return signal for execution
-            if signal['decision'] != 'HOLD':
-                logger.info(f"Signal for {symbol}: {signal['decision']} with {signal['confidence']}% confidence")
-                return {'signal': signal}
-            else:
-                logger.info(f"No trade signal for {symbol}")
-                return {}
+            return {'market_data': market_data}
 
         except Exception as e:
             logger.error(f"Error processing {symbol}: {e}")
             return {}
     
+    def _check_spreads(self, symbols: List[str]) -> Dict[str, bool]:
+        """Spread check for the given active symbols at once (unknown symbols fail)"""
+        infos = [self.symbol_cache.get(symbol) for symbol in symbols]
+        spreads = np.fromiter((info.spread if info else np.inf for info in infos),
+                              dtype=np.float64, count=len(infos))
+        # Limits for just these symbols, in the same order
+        max_allowed = self._max_spread_allowed[[self._symbol_index[symbol] for symbol in symbols]]
+        acceptable = spreads <= max_allowed
+
+        for i in np.flatnonzero(~acceptable & np.isfinite(spreads)):
+            logger.info(f"{symbols[i]} spread too high: {infos[i].spread} > {max_allowed[i]}")
+        return dict(zip(symbols, acceptable.tolist()))
+
     def _check_spread(self, symbol: str) -> bool:
         """Check if spread is acceptable for trading"""
-        symbol_info = mt5.symbol_info(symbol)
+        symbol_info = self.symbol_cache.get(symbol)
         if not symbol_info:
             return False
         
         current_spread = symbol_info.spread
-        max_spread = self.config['symbols'].get(symbol, {}).get('max_spread', 50)
+        settings = self._symbol_config.get(symbol)
+        max_spread = settings.max_spread if settings is not None else 50
         
         # Apply multiplier for volatile conditions
-        max_allowed = max_spread * self.config.get('max_spread_multiplier', 2.0)
+        max_allowed = max_spread * self._max_spread_multiplier
         
         if current_spread > max_allowed:
             logger.info(f"{symbol} spread too high: {current_spread} > {max_allowed}")
@@ -2005,60 +3058,27 @@ class TradingBot:
         
         return True
     
-    def _is_good_trading_session(self, symbol: str) -> bool:
+    def _is_good_trading_session(self, symbol: str, now: datetime = None) -> bool:
         """Check if current session is good for trading this symbol"""
-        now = datetime.now()
-        hour = now.hour
-        
-        sessions = self.config['trading_sessions']
-        
-        # Determine best sessions for each symbol type
-        symbol_sessions = {
-            'EURUSD': ['EUROPEAN', 'US'],
-            'GBPUSD': ['EUROPEAN', 'US'],
-            'USDJPY': ['ASIAN', 'US'],
-            'AUDUSD': ['ASIAN', 'US'],
-            'NZDUSD': ['ASIAN', 'US'],
-            'XAUUSD': ['EUROPEAN', 'US'],  # Gold most active in London/NY
-            'USOIL': ['US'],
-            'US30': ['US'],
-            'US500': ['US'],
-            'NAS100': ['US'],
-            'DE30': ['EUROPEAN'],
-            'UK100': ['EUROPEAN'],
-            'JP225': ['ASIAN']
-        }
-        
-        # Get preferred sessions for this symbol
-        preferred = symbol_sessions.get(symbol, ['EUROPEAN', 'US'])
+        # Hours that fall in this symbol's preferred sessions
+        hours = self._session_hour_masks.get(symbol, self._default_session_hour_mask)
         
-        # Check if we're in a preferred session
-        current_session = None
-        for session_name, session_info in sessions.items():
-            if session_name == 'enabled':
-                continue
-            if session_info['start'] <= hour < session_info['end']:
-                current_session = session_name
-                break
-        
-        if current_session in preferred:
-            return True
-        
-        # Allow trading with reduced confidence outside preferred sessions
-        return False  # You can change this to True if you want 24/5 trading
+        # Outside preferred sessions we don't trade - return True here if you want 24/5 trading
+        return bool(hours >> (now or datetime.now()).hour & 1)
     
-    def _is_market_open(self, symbol: str) -> bool:
+    def _is_market_open(self, symbol: str, now: datetime = None) -> bool:
         """Check if market is open for trading"""
         # Get current time
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         weekday = now.weekday()
 
         # Forex market is closed on weekends
         if weekday >= 5:  # Saturday = 5, Sunday = 6
             return False
 
-        # Check if symbol is tradeable
-        symbol_info = mt5.symbol_info(symbol)
+        # Check if symbol is tradeable (snapshot shared with the spread check and risk manager)
+        symbol_info = self.symbol_cache.get(symbol)
         if symbol_info is None:
             logger.warning(f"Symbol {symbol} not found")
             return False
@@ -2067,21 +3087,18 @@ class TradingBot:
         if not symbol_info.trade_mode == mt5.SYMBOL_TRADE_MODE_FULL:
             return False
 
-        # Simple check: if we can get a tick, market is open
-        tick = mt5.symbol_info_tick(symbol)
-        if tick is None:
-            return False
-
-        # Check if bid and ask are valid (non-zero)
-        if tick.bid > 0 and tick.ask > 0:
-            return True
-
-        return False
+        # Simple check: market is open if the last quote has valid (non-zero) bid and ask
+        return symbol_info.bid > 0 and symbol_info.ask > 0
     
-    def _show_account_status(self):
+    def _show_account_status(self, positions=None, account_info=None):
         """Display account status"""
-        account_info = mt5.account_info()
-        positions = mt5.positions_get()
+        if account_info is None:
+            account_info = mt5.account_info()
+            if account_info is None:
+                logger.warning("Account status unavailable: no account info")
+                return
+        if positions is None:
+            positions = mt5.positions_get()
         
         logger.info("=" * 50)
         logger.info(f"Account Balance: ${account_info.balance:.2f}")
@@ -2106,20 +3123,32 @@ class TradingBot:
         
         # Disconnect from MT5
         self.mt5_conn.disconnect()
+
+        if self._symbol_pool is not None:
+            self._symbol_pool.shutdown(wait=True)
+            self._symbol_pool = None
+
+        if self.telegram:
+            self.telegram.close()
+        self.news_checker.close()
+        _stop_background_loop()
         logger.info("Trading Bot stopped")
     
-    def _check_risk_alerts(self):
+    def _check_risk_alerts(self, account_info=None):
         """Check and send risk management alerts"""
         if not self.telegram:
             return
         
-        account_info = mt5.account_info()
+        if account_info is None:
+            account_info = mt5.account_info()
+            if account_info is None:  # No snapshot - check again next iteration
+                return
         current_balance = account_info.balance
         
         # Check daily loss
         daily_loss_percent = (self.risk_manager.initial_balance - current_balance) / self.risk_manager.initial_balance
         if daily_loss_percent >= self.risk_manager.max_daily_loss * 0.8:  # Alert at 80% of limit
-            if not hasattr(self, '_daily_loss_alerted'):
+            if not self._daily_loss_alerted:
                 self.telegram.send_risk_alert('DAILY_LOSS_WARNING', {
                     'loss_percent': daily_loss_percent * 100,
                     'balance': current_balance
@@ -2127,14 +3156,11 @@ class TradingBot:
                 self._daily_loss_alerted = True
         
         # Check drawdown
-        if not hasattr(self, '_peak_balance'):
-            self._peak_balance = current_balance
-        else:
-            self._peak_balance = max(self._peak_balance, current_balance)
+        self._peak_balance = max(self._peak_balance, current_balance)
         
         drawdown = (self._peak_balance - current_balance) / self._peak_balance * 100
         if drawdown > 10:  # Alert if drawdown > 10%
-            if not hasattr(self, '_last_drawdown_alert') or drawdown - self._last_drawdown_alert > 5:
+            if drawdown - self._last_drawdown_alert > 5:
                 self.telegram.send_risk_alert('HIGH_DRAWDOWN', {
                     'drawdown': drawdown,
                     'peak': self._peak_balance,
@@ -2149,36 +3175,13 @@ class TradingBot:
         if not positions:
             return
         
-        for position in positions:
-            if position.magic != self.executor.magic_number:
-                continue
-            
-            # Close position
-            close_type = mt5.ORDER_TYPE_SELL if position.type == 0 else mt5.ORDER_TYPE_BUY
-            price = mt5.symbol_info_tick(position.symbol).bid if position.type == 0 else mt5.symbol_info_tick(position.symbol).ask
-            
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": position.symbol,
-                "volume": position.volume,
-                "type": close_type,
-                "position": position.ticket,
-                "price": price,
-                "deviation": 20,
-                "magic": self.executor.magic_number,
-                "comment": "Bot shutdown - closing position",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
-            }
-            
-            result = mt5.order_send(request)
-            if result.retcode == mt5.TRADE_RETCODE_DONE:
-                logger.info(f"Closed position {position.ticket}")
-                if self.telegram:
-                    self.telegram.send_trade_alert('CLOSED', {}, position.symbol,
-                                                  result={'order': position.ticket,
-                                                         'price': price,
-                                                         'profit': position.profit})
+        ticks = {}  # one tick per symbol
+        with self.executor.order_batch():
+            for position in filter(self.executor.is_our_position, positions):
+                tick = ticks.get(position.symbol)
+                if tick is None:
+                    tick = ticks[position.symbol] = mt5.symbol_info_tick(position.symbol)
+                self.executor.close_position(position, tick, comment="Bot shutdown - closing position")
 
 # Main execution
 if __name__ == "__main__":
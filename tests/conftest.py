@@ -0,0 +1,29 @@
+"""Shared test setup - the bot is tested without a MetaTrader 5 terminal or Gemini key"""
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# MetaTrader5 only ships for Windows; tests monkeypatch the terminal calls they need
+try:
+    import MetaTrader5  # noqa: F401
+except ImportError:
+    mt5 = types.ModuleType('MetaTrader5')
+    mt5.__dict__.update(
+        ORDER_TYPE_BUY=0, ORDER_TYPE_SELL=1, POSITION_TYPE_BUY=0,
+        TRADE_ACTION_DEAL=1, TRADE_ACTION_SLTP=6, ORDER_TIME_GTC=0, ORDER_FILLING_IOC=1,
+        TRADE_RETCODE_DONE=10009, SYMBOL_TRADE_MODE_FULL=4,
+        TIMEFRAME_M5=5, TIMEFRAME_M15=15, TIMEFRAME_H1=16385, TIMEFRAME_H4=16388, TIMEFRAME_D1=16408,
+    )
+    sys.modules['MetaTrader5'] = mt5
+
+try:
+    import google.generativeai  # noqa: F401
+except ImportError:
+    genai = types.ModuleType('google.generativeai')
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = lambda *args, **kwargs: None
+    google = sys.modules.setdefault('google', types.ModuleType('google'))
+    google.generativeai = genai
+    sys.modules['google.generativeai'] = genai
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import main
+
+
+@pytest.fixture
+def executor():
+    return main.MT5TradingExecutor(main.RiskManager(10000.0))
+
+
+def test_trade_journal_opens_on_first_trade(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    executor = main.MT5TradingExecutor(main.RiskManager(10000.0))
+    assert not (tmp_path / 'trades.json').exists()
+
+    signal = {'decision': 'BUY', 'confidence': 80, 'stop_loss': 1.09, 'take_profit_1': 1.12}
+    executor._log_trade(signal, 'EURUSD', 0.1, SimpleNamespace(price=1.1, order=42))
+    executor._trade_log_file.close()
+    assert main._json_loads((tmp_path / 'trades.json').read_bytes())['order_ticket'] == 42
+
+
+class FakeMarketData:
+    """Market data provider with a fixed ATR and no cached analysis"""
+    ANALYSIS_BARS = main.MarketDataMT5.ANALYSIS_BARS
+
+    def __init__(self, atr):
+        self.atr = atr
+        self.requests = []
+
+    def get_last_atr(self, symbol, bar):
+        return None
+
+    def get_rates(self, symbol, timeframe, count):
+        self.requests.append(count)
+        return pd.DataFrame({'close': [1.0]})
+
+    def calculate_atr(self, df):
+        return [self.atr]
+
+
+def test_h1_atr_fallback_uses_analysis_bar_count_and_caches_zero(executor):
+    provider = FakeMarketData(atr=0.0)
+    assert executor._get_h1_atr('EURUSD', provider) == 0.0
+    assert executor._get_h1_atr('EURUSD', provider) == 0.0
+    assert provider.requests == [main.MarketDataMT5.ANALYSIS_BARS]
+
+
+class FakeSymbolCache:
+    def get(self, symbol):
+        return SimpleNamespace(point=0.00001, digits=5)
+
+
+@pytest.fixture
+def exit_actions(executor, monkeypatch):
+    """Record exit actions instead of sending orders; positions risk 10 pips from 1.10000"""
+    calls = []
+    executor.symbol_cache = FakeSymbolCache()
+    monkeypatch.setattr(executor, '_partial_close',
+                        lambda position, volume, reason, tick=None: calls.append(reason.split(' ')[0]))
+    monkeypatch.setattr(executor, '_set_break_even',
+                        lambda position, symbol_info=None: calls.append('BE'))
+    monkeypatch.setattr(executor, '_advanced_trail_stop',
+                        lambda position, price, rr, symbol_info=None: calls.append('TP3'))
+    monkeypatch.setattr(executor, '_dynamic_trail_stop', lambda position, price, provider: None)
+    return calls
+
+
+def manage_at(executor, monkeypatch, bid):
+    tick = SimpleNamespace(bid=bid, ask=bid + 0.00002)
+    monkeypatch.setattr(main.mt5, 'symbol_info_tick', lambda symbol: tick, raising=False)
+    position = SimpleNamespace(ticket=1, symbol='EURUSD', type=main.mt5.POSITION_TYPE_BUY, price_open=1.1,
+                               sl=1.099, tp=1.13, volume=1.0, magic=executor.magic_number)
+    executor.manage_open_positions(None, None, positions=[position])
+
+
+@pytest.mark.parametrize('bid, expected, flags', [
+    (1.10051, ['BE'], main.MT5TradingExecutor.BE_SET),
+    (1.10101, ['TP1'], main.MT5TradingExecutor.TP1_CLOSED),
+    (1.10201, ['TP1'], main.MT5TradingExecutor.TP1_CLOSED),
+    (1.10301, ['TP1'], main.MT5TradingExecutor.TP1_CLOSED),
+    (1.1002, [], None),
+])
+def test_exit_rules_first_match_wins(executor, exit_actions, monkeypatch, bid, expected, flags):
+    manage_at(executor, monkeypatch, bid)
+    assert exit_actions == expected
+    assert executor._position_metadata.get(1) == flags
+
+
+def test_exit_rules_step_through_flags(executor, exit_actions, monkeypatch):
+    for _ in range(3):
+        manage_at(executor, monkeypatch, 1.10301)
+    manage_at(executor, monkeypatch, 1.10051)
+    # TP1 and TP2 fire once, the TP3 trail repeats, break-even still fires once below 1:1
+    assert exit_actions == ['TP1', 'TP2', 'TP3', 'BE']
+    executor_cls = main.MT5TradingExecutor
+    assert executor._position_metadata[1] == executor_cls.TP1_CLOSED | executor_cls.TP2_CLOSED | executor_cls.BE_SET
+
+
+def test_exit_rule_metadata_dropped_for_closed_tickets(executor, exit_actions, monkeypatch):
+    manage_at(executor, monkeypatch, 1.10101)
+    executor._position_metadata[99] = main.MT5TradingExecutor.BE_SET
+    manage_at(executor, monkeypatch, 1.10101)
+    assert list(executor._position_metadata) == [1]
@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+
+def market_data(**extra):
+    return {'symbol': 'EURUSD', 'current_price': 1.1, 'ask': 1.1002, 'spread': 12, 'digits': 5, **extra}
+
+
+@pytest.fixture
+def news_calls():
+    return []
+
+
+@pytest.fixture
+def gemini(news_calls):
+    def should_avoid_trading(symbol, minutes_before=30, minutes_after=30):
+        news_calls.append(symbol)
+        return True, 'NFP in 10 minutes'
+
+    return main.GeminiTradingAI('key', SimpleNamespace(should_avoid_trading=should_avoid_trading))
+
+
+@pytest.mark.parametrize('news_flag, warned', [((True, 'CPI in 5 minutes'), True), ((False, ''), False)])
+def test_prompt_uses_precomputed_news_flag(gemini, news_calls, news_flag, warned):
+    prompt = gemini._build_prompt(market_data(news_flag=news_flag))
+    assert ('NEWS WARNING: CPI in 5 minutes' in prompt) is warned
+    assert news_calls == []
+
+
+def test_prompt_checks_news_without_a_flag(gemini, news_calls):
+    assert 'NEWS WARNING: NFP in 10 minutes' in gemini._build_prompt(market_data())
+    assert news_calls == ['EURUSD']
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def risk_manager():
+    return main.RiskManager(10000.0)
+
+
+def positions(*symbols):
+    return tuple(SimpleNamespace(symbol=symbol) for symbol in symbols)
+
+
+def test_correlated_symbols_cover_every_shared_group(risk_manager):
+    correlated = risk_manager._correlated_symbols
+    # EURUSD sits in both USD_pairs and EUR_pairs
+    assert {'GBPUSD', 'EURGBP', 'EURUSD'} <= correlated['EURUSD']
+    assert 'EURGBP' not in correlated['GBPUSD']
+    assert correlated['XAUUSD'] == {'XAUUSD', 'XAUEUR'}
+
+
+@pytest.mark.parametrize('symbol, open_symbols, allowed', [
+    ('EURUSD', ('GBPUSD', 'EURGBP'), False),
+    ('GBPUSD', ('EURGBP', 'EURJPY'), True),
+    ('XAUUSD', ('EURUSD', 'XAUEUR'), True),
+    ('BTCUSD', ('BTCUSD', 'BTCUSD'), True),  # Not in any group
+])
+def test_correlation_limit(risk_manager, symbol, open_symbols, allowed):
+    assert risk_manager.check_correlation_limit(symbol, positions(*open_symbols)) is allowed
+
+
+def test_correlation_limit_ignores_broker_suffixes(risk_manager):
+    assert not risk_manager.check_correlation_limit('EURUSDc', positions('GBPUSDc', 'EURUSD.pro'))
+    assert risk_manager.check_correlation_limit('XAUUSDc', positions('EURUSDc', 'XAUEURc'))
+
+
+def test_correlation_limit_fetches_positions_when_not_given(risk_manager, monkeypatch):
+    monkeypatch.setattr(main.mt5, 'positions_get', lambda: positions('XAUUSDc', 'XAUEUR'), raising=False)
+    assert not risk_manager.check_correlation_limit('XAUUSDc')
+
+
+@pytest.mark.parametrize('balance, npos, expected', [
+    (10000.0, 0, 'Can open trade'),
+    (9701.0, 4, 'Can open trade'),
+    (9700.0, 0, 'Daily loss limit reached'),
+    (9500.0, 0, 'Daily loss limit reached'),
+    (10000.0, 5, 'Maximum open trades reached: 5'),
+])
+def test_can_open_trade(risk_manager, balance, npos, expected):
+    account_info = SimpleNamespace(balance=balance)
+    _, reason = risk_manager.can_open_trade(account_info=account_info, positions=positions(*['BTCUSD'] * npos))
+    assert reason == expected
+
+
+def test_weekly_limit_reported_when_tighter_than_daily():
+    risk_manager = main.RiskManager(10000.0, {'max_daily_loss': 0.06, 'max_weekly_loss': 0.05})
+    account_info = SimpleNamespace(balance=9450.0)
+    assert risk_manager.can_open_trade(account_info=account_info, positions=()) == (False, "Weekly loss limit reached")
+
+
+@pytest.mark.parametrize('field', ['initial_balance', 'max_daily_loss', 'max_weekly_loss'])
+def test_loss_gate_inputs_are_read_only(risk_manager, field):
+    with pytest.raises(AttributeError):
+        setattr(risk_manager, field, 0.0)
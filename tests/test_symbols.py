@@ -0,0 +1,36 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize('symbol, base', [
+    ('EURUSD', 'EURUSD'),
+    ('EURUSDc', 'EURUSD'),
+    ('EURUSD.pro', 'EURUSD'),
+    ('XAUUSDm#', 'XAUUSD'),
+    ('US30', 'US30'),
+])
+def test_base_symbol_strips_broker_suffix(symbol, base):
+    assert main._base_symbol(symbol) == base
+
+
+@pytest.fixture
+def news(monkeypatch):
+    """ForexFactoryNews without the background calendar refresh or the disk cache"""
+    async def no_refresh(self):
+        return None
+
+    monkeypatch.setattr(main.ForexFactoryNews, '_refresh_loop', no_refresh)
+    monkeypatch.setattr(main.ForexFactoryNews, '_load_calendar_cache', lambda self: {})
+    news = main.ForexFactoryNews()
+    yield news
+    news.close()
+
+
+@pytest.mark.parametrize('symbol', ['EURUSD', 'EURUSDc', 'EURUSD.pro'])
+def test_currencies_for_broker_symbols(news, symbol):
+    assert news._currencies_for(symbol) == {'EUR', 'USD'}
+
+
+def test_currencies_for_unknown_symbol(news):
+    assert news._currencies_for('FOOBAR') == frozenset()
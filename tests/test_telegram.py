@@ -0,0 +1,34 @@
+import asyncio
+
+import main
+
+
+def consume(*messages):
+    """Sends made by the consumer for messages queued together"""
+    async def scenario():
+        notifier = main.TelegramNotifier.__new__(main.TelegramNotifier)
+        notifier._LINGER_SECONDS = 0.01
+        notifier._loop = asyncio.get_running_loop()
+        notifier._queue = asyncio.Queue()
+        sent = []
+
+        async def deliver(message, parse_mode):
+            sent.append(message)
+
+        notifier._deliver = deliver
+        for message in messages:
+            notifier._queue.put_nowait((message, 'HTML'))
+        consumer = asyncio.ensure_future(notifier._consume())
+        await notifier._queue.join()
+        consumer.cancel()
+        return sent
+
+    return asyncio.run(scenario())
+
+
+def test_burst_merges_into_one_send_without_repeats():
+    assert consume('msg 0', 'msg 0', 'msg 1', 'msg 0', 'msg 0') == ['msg 0\nmsg 1\nmsg 0']
+
+
+def test_repeat_of_a_multi_line_alert_is_dropped():
+    assert consume('a\nb', 'c', 'c', 'c') == ['a\nb\nc']
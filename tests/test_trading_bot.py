@@ -0,0 +1,112 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+
+class FakeSymbolCache:
+    def __init__(self, spreads):
+        self.spreads = spreads
+        self.requested = []
+
+    def get(self, symbol):
+        self.requested.append(symbol)
+        spread = self.spreads.get(symbol)
+        return SimpleNamespace(spread=spread) if spread is not None else None
+
+
+@pytest.fixture
+def make_bot(monkeypatch):
+    """TradingBot without the news refresher or a Gemini model"""
+    monkeypatch.setattr(main, 'ForexFactoryNews', lambda telegram: None)
+    monkeypatch.setattr(main, 'GeminiTradingAI', lambda api_key, news_checker: None)
+    return lambda config=None: main.TradingBot(config=config)
+
+
+def test_check_spreads_only_reads_the_given_symbols(make_bot):
+    bot = make_bot({'symbols': {'GBPUSD': {'enabled': True, 'max_spread': 30}}})
+    assert bot.symbols == ['EURUSDc', 'XAUUSDc', 'GBPUSD']
+    bot.symbol_cache = FakeSymbolCache({'XAUUSDc': 120, 'GBPUSD': 50})
+
+    # Limits are max_spread * 2.0 for each symbol, matched by name not position
+    assert bot._check_spreads(['XAUUSDc', 'GBPUSD']) == {'XAUUSDc': False, 'GBPUSD': True}
+    assert bot.symbol_cache.requested == ['XAUUSDc', 'GBPUSD']
+
+
+def test_check_spreads_fails_unknown_symbols(make_bot):
+    bot = make_bot()
+    bot.symbol_cache = FakeSymbolCache({})
+    assert bot._check_spreads(['EURUSDc']) == {'EURUSDc': False}
+
+
+def test_run_manages_positions_without_account_info(make_bot, monkeypatch):
+    bot = make_bot()
+    managed, batches, sleeps = [], [], []
+    open_positions = (SimpleNamespace(symbol='EURUSDc'),)
+    monkeypatch.setattr(main.mt5, 'account_info', lambda: None, raising=False)
+    monkeypatch.setattr(main.mt5, 'positions_get', lambda: open_positions, raising=False)
+    monkeypatch.setattr(main.mt5, 'last_error', lambda: (1, 'not connected'), raising=False)
+    monkeypatch.setattr(main.time, 'sleep', lambda seconds: sleeps.append(seconds) or setattr(bot, 'running', False))
+    bot.risk_manager = main.RiskManager(10000.0)
+    bot.gemini_ai = SimpleNamespace(analyze_batch=lambda market_data: batches.append(market_data) or [])
+    bot.executor = SimpleNamespace(manage_open_positions=lambda ai, provider, positions: managed.append(positions))
+    bot._next_news_alert = float('inf')
+    bot.telegram = SimpleNamespace(send_account_summary=lambda *a: pytest.fail('summary without account info'))
+    bot._check_interval = 30
+
+    bot.running = True
+    bot.run()
+
+    assert batches == [[]]
+    assert managed == [open_positions]
+    assert sleeps and sleeps[0] <= 31  # Bar-aligned sleep, not the 60 s error back-off
+
+
+@pytest.mark.parametrize('hours, session', [
+    (range(0, 5), 'US'),
+    (range(5, 14), 'ASIAN'),
+    (range(14, 20), 'EUROPEAN'),
+    (range(20, 24), 'US'),
+])
+def test_market_session_table_is_disjoint(monkeypatch, hours, session):
+    market_data = main.MarketDataMT5()
+    for hour in hours:
+        monkeypatch.setattr(main, 'datetime', SimpleNamespace(now=lambda hour=hour: datetime(2024, 1, 3, hour)))
+        assert market_data._get_market_session() == session
+
+
+def test_sessions_by_hour_wraps_past_midnight():
+    sessions = {'ASIAN': {'start': 0, 'end': 9}, 'US': {'start': 20, 'end': 5}, 'enabled': True}
+    by_hour = main._sessions_by_hour(sessions)
+    assert [by_hour[hour] for hour in (20, 23, 4)] == ['US', 'US', 'ASIAN']  # First listed session wins
+    assert by_hour[5] == 'ASIAN' and by_hour[9] is None and by_hour[19] is None
+
+
+def test_session_mask_with_midnight_wrap(make_bot):
+    bot = make_bot({'trading_sessions': {'EUROPEAN': {'start': 7, 'end': 16}, 'US': {'start': 22, 'end': 3},
+                                         'enabled': True}})
+    us_only = bot._session_hour_masks['US30']
+    assert us_only == (1 << 22) | (1 << 23) | 0b111
+    for hour, expected in ((21, False), (22, True), (0, True), (2, True), (3, False)):
+        assert bot._is_good_trading_session('US30', datetime(2024, 1, 3, hour)) is expected
+    # Symbols without their own sessions use the default EUROPEAN + US mask
+    assert bot._is_good_trading_session('EURUSDc', datetime(2024, 1, 3, 23))
+    assert not bot._is_good_trading_session('EURUSDc', datetime(2024, 1, 3, 18))
+
+
+def test_process_symbol_skips_analysis_until_a_new_bar(make_bot):
+    bot = make_bot({'use_news_filter': False, 'trading_sessions': {'enabled': False}})
+    analyzed, bar = [], [1000]
+    bot.market_data = SimpleNamespace(
+        latest_bar_time=lambda symbol: bar[0],
+        get_market_analysis=lambda symbol: analyzed.append(symbol) or {'symbol': symbol, 'bar_time': bar[0]})
+    bot._is_market_open = lambda symbol, now: True
+
+    assert bot._process_symbol('EURUSDc', None, None, True)
+    bot._last_bar_time['EURUSDc'] = 1000  # run() marks the bar once Gemini decided
+    assert bot._process_symbol('EURUSDc', None, None, True) == {}
+    bar[0] = 1300
+    assert bot._process_symbol('EURUSDc', None, None, True)
+    assert analyzed == ['EURUSDc', 'EURUSDc']